@@ -0,0 +1,225 @@
+import datetime
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from contextlib import redirect_stdout, redirect_stderr, nullcontext
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+from advent.inputs import InputForm, PuzzleInput, input_path, load_input, input_form_of, map_file
+from advent.registry import CACHE_DIR, SolverKey, get_solver
+from advent.runner import time_limit, SolverTimeout
+from advent.utils.solver import Answer, call_solver
+
+BENCH_DIR = CACHE_DIR / "bench"
+BASELINE_FILE = BENCH_DIR / "baseline.json"
+
+
+@dataclass
+class BenchResult:
+    year: str
+    key: str
+    variation: str
+    example: bool
+    warmup: int
+    times: list[float]
+    peak_memory: int
+    answer: Answer | None = None
+    error: str = ""
+
+    @property
+    def minimum(self) -> float:
+        return min(self.times)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.times)
+
+    @property
+    def p95(self) -> float:
+        if len(self.times) < 2:
+            return self.times[0]
+        return statistics.quantiles(self.times, n=20, method="inclusive")[18]
+
+    def to_json(self) -> dict:
+        result = asdict(self)
+        if self.times:
+            result.update(min=self.minimum, median=self.median, p95=self.p95)
+        return result
+
+
+def _fresh_input(form: InputForm, loaded: PuzzleInput) -> PuzzleInput:
+    match form:
+        case InputForm.LINES:
+            # Solvers may mutate their input, so every run gets its own copy
+            return list(loaded)
+        case InputForm.LINE_ITERATOR:
+            return iter(loaded)
+        case _:
+            # The mapping is read-only, it can be shared between runs
+            return loaded
+
+
+def _run_quietly(solver, form: InputForm, loaded: PuzzleInput, example: bool) -> Answer | None:
+    puzzle_input = _fresh_input(form, loaded)
+    with open(os.devnull, "wt") as devnull, redirect_stdout(devnull), redirect_stderr(devnull):
+        return call_solver(solver, puzzle_input=puzzle_input, example=example)
+
+
+def bench_solver(year: str, key: str, variation: str, example: bool, repeat: int, warmup: int, timeout: float | None) -> BenchResult:
+    """ Time a solver repeat times after warmup runs, with the input loaded only once.
+        Peak memory is measured in a separate run as tracemalloc slows down the timed ones.
+    """
+    solver = get_solver(year, key, variation)
+    form = input_form_of(solver)
+    result = BenchResult(year, key, variation, example, warmup, times=[], peak_memory=0)
+    input_context = map_file(input_path(year, key, example)) if form == InputForm.MMAP else nullcontext()
+    try:
+        with input_context as mapped, time_limit(timeout):
+            loaded = mapped if form == InputForm.MMAP else load_input(year=year, key=key, example=example)
+            for _ in range(warmup):
+                _run_quietly(solver, form, loaded, example)
+            for _ in range(repeat):
+                start = time.perf_counter()
+                result.answer = _run_quietly(solver, form, loaded, example)
+                result.times.append(time.perf_counter() - start)
+            tracemalloc.start()
+            try:
+                _run_quietly(solver, form, loaded, example)
+                result.peak_memory = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    except SolverTimeout:
+        result.error = f"timed out after {timeout}s"
+    except Exception as e:
+        result.error = repr(e)
+    return result
+
+
+def bench_solvers(solver_keys: list[SolverKey], example: bool, repeat: int, warmup: int, timeout: float | None) -> list[BenchResult]:
+    results = []
+    for year, key, variation in solver_keys:
+        if not input_path(year, key, example).exists():
+            print(f"{year:>8} {key:>7} {variation:>3}  no input", flush=True)
+            continue
+        result = bench_solver(year, key, variation, example=example, repeat=repeat, warmup=warmup, timeout=timeout)
+        print_bench_result(result)
+        results.append(result)
+    return results
+
+
+def print_bench_result(result: BenchResult):
+    prefix = f"{result.year:>8} {result.key:>7} {result.variation:>3}"
+    if result.error or not result.times:
+        print(f"{prefix}  {result.error or 'no runs'}", flush=True)
+    else:
+        print(f"{prefix}  min {result.minimum:9.4f}s  median {result.median:9.4f}s  p95 {result.p95:9.4f}s  "
+              f"peak {result.peak_memory / 1024 / 1024:9.2f} MiB  ({len(result.times)} runs)", flush=True)
+
+
+def write_bench_results(results: list[BenchResult], output_file: Path | None = None) -> Path:
+    now = datetime.datetime.now()
+    if output_file is None:
+        output_file = BENCH_DIR / f"bench_{now:%Y%m%d_%H%M%S}.json"
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, "wt") as file:
+        json.dump({"created": now.isoformat(),
+                   "python": platform.python_version(),
+                   "machine": platform.machine(),
+                   "results": [result.to_json() for result in results]},
+                  file, indent=2)
+    return output_file
+
+
+def _baseline_key(year: str, key: str, variation: str, example: bool) -> str:
+    return f"{year}/{key}/{variation}" + ("/example" if example else "")
+
+
+def load_baseline(baseline_file: Path = BASELINE_FILE) -> dict[str, dict]:
+    try:
+        with open(baseline_file, "rt") as file:
+            return json.load(file)["solvers"]
+    except FileNotFoundError:
+        return {}
+
+
+def baseline_solvers(baseline: dict[str, dict], example: bool) -> list[SolverKey]:
+    solver_keys = []
+    for entry in baseline.values():
+        if entry["example"] == example:
+            solver_keys.append((entry["year"], entry["key"], entry["variation"]))
+    return solver_keys
+
+
+def update_baseline(results: list[BenchResult], baseline_file: Path = BASELINE_FILE) -> int:
+    """ Record the median of every successful result, keeping entries for other solvers
+    """
+    baseline = load_baseline(baseline_file)
+    recorded = datetime.datetime.now().isoformat()
+    updated = 0
+    for result in results:
+        if result.error or not result.times:
+            continue
+        baseline[_baseline_key(result.year, result.key, result.variation, result.example)] = {
+            "year": result.year, "key": result.key, "variation": result.variation, "example": result.example,
+            "median": result.median, "runs": len(result.times), "recorded": recorded,
+        }
+        updated += 1
+    baseline_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(baseline_file, "wt") as file:
+        json.dump({"python": platform.python_version(), "machine": platform.machine(), "solvers": baseline},
+                  file, indent=2, sort_keys=True)
+    return updated
+
+
+@dataclass
+class Comparison:
+    result: BenchResult
+    baseline_median: float | None
+
+    @property
+    def ratio(self) -> float | None:
+        if self.baseline_median is None or not self.result.times:
+            return None
+        return self.result.median / self.baseline_median if self.baseline_median else float("inf")
+
+    def regressed(self, threshold: float, min_delta: float) -> bool:
+        """ Slower than the baseline by more than threshold (relative) and min_delta (absolute seconds).
+            The absolute floor keeps scheduler noise on millisecond solvers from failing the gate.
+        """
+        if self.result.error:
+            return True
+        if self.ratio is None:
+            return False
+        return self.ratio > 1 + threshold and self.result.median - self.baseline_median > min_delta
+
+
+def compare_to_baseline(results: list[BenchResult], baseline: dict[str, dict]) -> list[Comparison]:
+    comparisons = []
+    for result in results:
+        entry = baseline.get(_baseline_key(result.year, result.key, result.variation, result.example))
+        comparisons.append(Comparison(result, entry["median"] if entry else None))
+    return comparisons
+
+
+def print_comparisons(comparisons: list[Comparison], threshold: float, min_delta: float) -> int:
+    print()
+    print(f"{'year':>8} {'puzzle':>7} {'var':>3}  {'baseline':>10} {'median':>10} {'ratio':>7}")
+    regressions = 0
+    for comparison in comparisons:
+        result = comparison.result
+        baseline = f"{comparison.baseline_median:.4f}s" if comparison.baseline_median is not None else "-"
+        median = f"{result.median:.4f}s" if result.times else "-"
+        ratio = f"{comparison.ratio:.2f}x" if comparison.ratio is not None else "-"
+        verdict = ""
+        if comparison.regressed(threshold, min_delta):
+            regressions += 1
+            verdict = f"REGRESSION {result.error}".rstrip()
+        elif comparison.baseline_median is None:
+            verdict = "no baseline"
+        print(f"{result.year:>8} {result.key:>7} {result.variation:>3}  {baseline:>10} {median:>10} {ratio:>7}  {verdict}")
+    print(f"\n{regressions} of {len(comparisons)} solvers regressed by more than {threshold:.0%} and {min_delta}s")
+    return regressions
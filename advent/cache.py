@@ -0,0 +1,130 @@
+import ast
+import hashlib
+import json
+import os
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+from advent.inputs import input_path
+from advent.registry import CACHE_DIR, solver_index
+from advent.utils.solver import Answer
+
+ANSWER_CACHE_DIR = CACHE_DIR / "answers"
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+
+_PACKAGE_ROOT = Path(__file__).parent.parent
+# Only used to register solvers, changes to it do not change any answer
+_IGNORED_MODULES = {"advent", "advent.registry"}
+
+
+@dataclass
+class CachedResult:
+    answer: Answer | None
+    # Only kept for solvers that print their answer instead of returning it
+    output: str
+    seconds: float
+
+
+def _module_file(module_name: str) -> Path | None:
+    path = _PACKAGE_ROOT.joinpath(*module_name.split("."))
+    if path.with_suffix(".py").is_file():
+        return path.with_suffix(".py")
+    if (path / "__init__.py").is_file():
+        return path / "__init__.py"
+    return None
+
+
+def _imported_modules(path: Path) -> set[str]:
+    modules = set()
+    for node in ast.walk(ast.parse(path.read_bytes(), filename=str(path))):
+        if isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.add(node.module)
+            # from advent.utils import grid imports a submodule rather than a name
+            modules.update(f"{node.module}.{alias.name}" for alias in node.names)
+    return {module for module in modules if module.split(".")[0] == "advent" and module not in _IGNORED_MODULES}
+
+
+def source_hash(module_name: str) -> str:
+    """ Hash the source of a module together with every advent module it imports, transitively
+    """
+    seen: dict[str, Path] = {}
+    to_visit = [module_name]
+    while to_visit:
+        name = to_visit.pop()
+        if name in seen or not (path := _module_file(name)):
+            continue
+        seen[name] = path
+        to_visit.extend(_imported_modules(path))
+    digest = hashlib.sha256()
+    for name in sorted(seen):
+        digest.update(name.encode())
+        digest.update(seen[name].read_bytes())
+    return digest.hexdigest()
+
+
+def file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AnswerCache:
+    def __init__(self, directory: Path = ANSWER_CACHE_DIR, max_size: int = DEFAULT_CACHE_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+
+    def key(self, year: str, key: str, variation: str, example: bool) -> str | None:
+        """ None when the result cannot be cached, because the solver module or the input is unknown
+        """
+        module_name = solver_index().get((year, key, variation))
+        path = input_path(year, key, example)
+        if not module_name or not path.exists():
+            return None
+        parts = [year, key, variation, str(example), file_hash(path), source_hash(module_name)]
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    def _entry_file(self, cache_key: str) -> Path:
+        return self.directory / f"{cache_key}.json"
+
+    def get(self, cache_key: str) -> CachedResult | None:
+        entry_file = self._entry_file(cache_key)
+        try:
+            with open(entry_file, "rt") as file:
+                result = CachedResult(**json.load(file))
+        except (OSError, ValueError, TypeError):
+            return None
+        # Eviction is least recently used, so a hit counts as a use
+        os.utime(entry_file)
+        return result
+
+    def put(self, cache_key: str, result: CachedResult):
+        content = json.dumps(asdict(result))
+        if len(content) > self.max_size:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry_file = self._entry_file(cache_key)
+        temp_file = entry_file.with_suffix(f".{os.getpid()}.tmp")
+        temp_file.write_text(content)
+        os.replace(temp_file, entry_file)
+        self.evict()
+
+    def evict(self):
+        """ Remove least recently used entries until the cache fits in max_size bytes
+        """
+        entries = []
+        for entry_file in self.directory.glob("*.json"):
+            try:
+                stat = entry_file.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_file))
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry_file in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            entry_file.unlink(missing_ok=True)
+            total_size -= size
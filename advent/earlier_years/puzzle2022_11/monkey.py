@@ -62,16 +62,22 @@ class Monkey:
         if do_log:
             self.logger.log(message)
 
+    def inspect(self, item: ANumber, detail_log: bool) -> tuple[ANumber, int]:
+        """ Returns the new worry level of the item and the monkey it is thrown to
+        """
+        self.log(detail_log, f"Monkey inspects an item with a worry level of {item}.")
+        item = self.operation.apply(item, detail_log)
+        item = item // self.RELIEF_FACTOR
+        self.log(detail_log, f"Monkey gets bored with item. Worry level is divided by 3 to {item}.")
+        target_monkey = self.throw_test.throws_to_monkey(item, detail_log)
+        self.log(detail_log, f"Item with worry level {item} is thrown to monkey {target_monkey}.")
+        return item, target_monkey
+
     def play_turn(self, detail_log: bool):
         self.log(detail_log, f"Monkey {self.monkey_id}: ")
         for item in self.items:
-            self.log(detail_log, f"Monkey inspects an item with a worry level of {item}.")
             self.items_inspected += 1
-            item = self.operation.apply(item, detail_log)
-            item = item // self.RELIEF_FACTOR
-            self.log(detail_log, f"Monkey gets bored with item. Worry level is divided by 3 to {item}.")
-            target_monkey = self.throw_test.throws_to_monkey(item, detail_log)
-            self.log(detail_log, f"Item with worry level {item} is thrown to monkey {target_monkey}.")
+            item, target_monkey = self.inspect(item, detail_log)
             self.monkeys[target_monkey].add(item)
         # All items will have been thrown to some other monkey
         self.items = []
@@ -1,10 +1,13 @@
+from collections import Counter
 from math import prod
 from pathlib import Path
 
 from advent.earlier_years.puzzle2022_11.logger import LogStreamer
 from advent.earlier_years.puzzle2022_11.monkey import Monkey, WorrisomeMonkey
+from advent.earlier_years.puzzle2022_11.number import ANumber
 from advent.earlier_years.puzzle2022_11.parser import parse_puzzle_lines
 from advent.registry import register_solver
+from advent.utils.cycles import detect_cycle
 
 
 def expected_output(example: bool, postfix: str = "") -> list[str]:
@@ -43,6 +46,58 @@ def solve_a(puzzle_input: list[str], example: bool) -> None:
     print(str(items_inspected[0] * items_inspected[1]))
 
 
+ItemState = tuple[int, ANumber]
+
+
+def play_item_round(monkeys: dict[int, Monkey], state: ItemState, inspections: Counter[int]) -> ItemState:
+    """ Follow a single item through one round. Items never influence each other, so this is
+        the same as playing the whole round. Monkeys take their turns in order of their ids.
+    """
+    monkey_id, item = state
+    while True:
+        inspections[monkey_id] += 1
+        item, target_monkey = monkeys[monkey_id].inspect(item, False)
+        if target_monkey < monkey_id:
+            # Its new monkey already had its turn this round
+            return target_monkey, item
+        monkey_id = target_monkey
+
+
+def item_inspections_at_rounds(monkeys: dict[int, Monkey], state: ItemState, rounds: list[int]) -> dict[int, Counter[int]]:
+    """ Inspections per monkey of a single item after each of the rounds. Every item soon loops,
+        after which the rounds are skipped a whole loop at a time.
+    """
+    inspections: Counter[int] = Counter()
+    result: dict[int, Counter[int]] = {}
+    rounds_played = 0
+
+    def play_round(item_state: ItemState) -> ItemState:
+        nonlocal rounds_played
+        item_state = play_item_round(monkeys, item_state, inspections)
+        rounds_played += 1
+        if rounds_played in rounds:
+            result[rounds_played] = inspections.copy()
+        return item_state
+
+    search = detect_cycle(state, play_round, fingerprint=lambda item_state: (item_state[0], int(item_state[1])), max_steps=max(rounds))
+    if search.cycle_length:
+        # Inspections after every round of one more loop, relative to where the loop was found
+        start_inspections = inspections.copy()
+        along_loop: list[Counter[int]] = [Counter()]
+        state = search.state
+        for _ in range(search.cycle_length):
+            state = play_item_round(monkeys, state, inspections)
+            along_loop.append(inspections - start_inspections)
+        for round_number in rounds:
+            if round_number > search.steps:
+                loops, rest = divmod(round_number - search.steps, search.cycle_length)
+                total = start_inspections + along_loop[rest]
+                for monkey_id, count in along_loop[-1].items():
+                    total[monkey_id] += count * loops
+                result[round_number] = total
+    return result
+
+
 @register_solver(year="2022", key="11", variation="b")
 def solve_b(puzzle_input: list[str], example: bool) -> None:
     print(puzzle_input)
@@ -56,14 +111,17 @@ def solve_b(puzzle_input: list[str], example: bool) -> None:
 
     print(f"Preparation done, monkeys are: {monkeys}")
 
-    for i in range(1, 10001):
+    inspections_at: dict[int, Counter[int]] = {i: Counter() for i in log_at}
+    for monkey in monkeys.values():
+        for item in monkey.items:
+            for i, inspections in item_inspections_at_rounds(monkeys, (monkey.monkey_id, item), log_at).items():
+                inspections_at[i].update(inspections)
+    for i in log_at:
+        logger.log(f"== After round {i} ==")
         for monkey in monkeys.values():
-            monkey.play_turn(False)
-        if i in log_at:
-            logger.log(f"== After round {i} ==")
-            for monkey in monkeys.values():
-                monkey.report_inspections()
-            logger.log("")
+            monkey.items_inspected = inspections_at[i][monkey.monkey_id]
+            monkey.report_inspections()
+        logger.log("")
     if example:
         for log_line, expected_line in zip(logger.log_lines, expected_output(example, postfix="_b")):
             if log_line != expected_line:
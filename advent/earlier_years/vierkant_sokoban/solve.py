@@ -1,12 +1,11 @@
 from collections import deque
 from collections.abc import Generator
 from dataclasses import dataclass, field
-from itertools import starmap
 from typing import Self
 
 from advent.registry import register_solver
 from advent.utils.enums import PrintEnum, Direction
-from advent.utils.grid import Grid, Coords
+from advent.utils.grid import CompactGrid, Coords
 
 
 class TileStatus(PrintEnum):
@@ -15,7 +14,8 @@ class TileStatus(PrintEnum):
     GOAL_CHAIR = "GOAL_CHAIR", "O"
 
 
-TileGrid = Grid[TileStatus]
+# Attempts copy the grid on every move, CompactGrid makes those copies cheap
+TileGrid = CompactGrid[TileStatus]
 
 
 @dataclass
@@ -42,10 +42,9 @@ class Attempt:
         return self.__class__(grid=grid, moves=new_moves)
 
     @property
-    def primary_key(self) -> tuple[Coords, ...]:
-        chair_coords = list(starmap(Coords, self.grid.all_coords_for({TileStatus.CHAIR})))
-        goal_chair_coords = list(starmap(Coords, self.grid.all_coords_for({TileStatus.GOAL_CHAIR})))
-        return tuple(sorted(chair_coords) + sorted(goal_chair_coords))
+    def primary_key(self) -> bytes:
+        # The positions of all chairs and the goal chair, which is exactly the grid content
+        return self.grid.snapshot()
 
     @property
     def finished(self) -> bool:
@@ -75,9 +74,9 @@ def generate_possible_moves(grid: TileGrid) -> Generator[tuple[Coords, Direction
 
 @register_solver(year="vierkant", key="sokoban", variation="a")
 def solve_a(puzzle_input: list[str], example: bool) -> None:
-    grid = Grid.from_lines(puzzle_input, TileStatus.from_char)
+    grid = CompactGrid.from_lines(puzzle_input, TileStatus.from_char)
 
-    visited: set[tuple[Coords, ...]] = set()
+    visited: set[bytes] = set()
 
     attempts: deque[Attempt] = deque()
     attempts.append(Attempt(grid))
@@ -0,0 +1,73 @@
+import mmap
+from contextlib import contextmanager
+from enum import Enum
+from pathlib import Path
+from typing import Generator, Iterator
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+class InputForm(Enum):
+    """ How a solver wants its puzzle input handed to it
+    """
+    # list[str] of lines with trailing whitespace stripped, the original form
+    LINES = "lines"
+    # Iterator[str] yielding the stripped lines while reading the file
+    LINE_ITERATOR = "line_iterator"
+    # Read-only mmap of the raw file bytes, supports slicing, find and bytes regexes
+    MMAP = "mmap"
+
+
+PuzzleInput = list[str] | Iterator[str] | mmap.mmap | bytes
+
+
+def input_path(year: str, key: str, example: bool) -> Path:
+    example_postfix = "_example" if example else ""
+    return DATA_DIR / year / f"input{key}{example_postfix}.txt"
+
+
+def load_input(year: str, key: str, example: bool) -> list[str]:
+    with open(input_path(year, key, example), "rt") as file:
+        return [line.rstrip() for line in file]
+
+
+def _iterate_lines(path: Path) -> Generator[str, None, None]:
+    with open(path, "rt") as file:
+        for line in file:
+            yield line.rstrip()
+
+
+@contextmanager
+def map_file(path: Path) -> Generator[mmap.mmap | bytes, None, None]:
+    with open(path, "rb") as file:
+        if path.stat().st_size == 0:
+            # mmap refuses empty files
+            yield b""
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+@contextmanager
+def open_input(year: str, key: str, example: bool, form: InputForm = InputForm.LINES) -> Generator[PuzzleInput, None, None]:
+    """ Provide the puzzle input in the requested form, resources are released when the context exits
+    """
+    path = input_path(year, key, example)
+    match form:
+        case InputForm.LINES:
+            yield load_input(year=year, key=key, example=example)
+        case InputForm.LINE_ITERATOR:
+            lines = _iterate_lines(path)
+            try:
+                yield lines
+            finally:
+                lines.close()
+        case InputForm.MMAP:
+            with map_file(path) as mapped:
+                yield mapped
+        case _:
+            raise ValueError(f"Unsupported input form {form}")
+
+
+def input_form_of(solver) -> InputForm:
+    return getattr(solver, "input_form", InputForm.LINES)
@@ -1,32 +1,186 @@
+import io
+import os
+import sys
+import time
 from argparse import ArgumentParser
+from contextlib import nullcontext, redirect_stdout, ExitStack
 from pathlib import Path
 
-from advent.registry import get_solver, import_all_solvers
+from advent.bench import (BASELINE_FILE, bench_solvers, write_bench_results, update_baseline, load_baseline,
+                          baseline_solvers, compare_to_baseline, print_comparisons)
+from advent.cache import AnswerCache, CachedResult, DEFAULT_CACHE_SIZE
+from advent.inputs import open_input, input_form_of
+from advent.profiling import profiled, profile_file, tracing_allocations, recorded_spans
+from advent.registry import get_solver
+from advent.runner import select_solvers, run_all, print_run_table
+from advent.utils.solver import call_solver, set_solver_jobs
 
+COMMANDS = ["solve", "run-all", "bench", "compare"]
 
-def load_input(year: str, key: str, example: bool) -> list[str]:
-    data_dir = Path(__file__).parent.parent / "data"
 
-    example_postfix = "_example" if example else ""
-    with open(data_dir / year / f"input{key}{example_postfix}.txt", "rt") as file:
-        return [line.rstrip() for line in file]
+class _Tee(io.TextIOBase):
+    def __init__(self, *streams):
+        self.streams = streams
 
+    def write(self, text: str) -> int:
+        for stream in self.streams:
+            stream.write(text)
+        return len(text)
 
-def main():
-    import_all_solvers()
+    def flush(self):
+        for stream in self.streams:
+            stream.flush()
 
-    parser = ArgumentParser(prog="AdventOfCode_solver")
-    parser.add_argument("-y", "--year", required=True)
-    parser.add_argument("-p", "--puzzle", required=True)
-    parser.add_argument("-v", "--variation", required=True)
-    parser.add_argument("-e", "--example", action="store_true")
-    args = parser.parse_args()
+
+def _run_and_cache(args, cache: AnswerCache | None, cache_key: str | None) -> CachedResult:
     solver = get_solver(year=args.year, key=args.puzzle, variation=args.variation)
-    if solver:
-        puzzle_input = load_input(year=args.year, key=args.puzzle, example=args.example)
-        solver(puzzle_input=puzzle_input, example=args.example)
-    else:
+    if not solver:
         raise NotImplementedError(f"No support for combination {args.year}, {args.puzzle}, {args.variation}")
+    output = io.StringIO()
+    with open_input(args.year, args.puzzle, args.example, input_form_of(solver)) as puzzle_input:
+        start = time.perf_counter()
+        with redirect_stdout(_Tee(sys.stdout, output)) if cache_key else nullcontext(), ExitStack() as instruments:
+            if args.profile:
+                instruments.enter_context(profiled(profile_file(args.year, args.puzzle, args.variation, args.example), top=args.profile_top))
+            if args.trace_alloc:
+                instruments.enter_context(tracing_allocations(solver, top=args.trace_alloc))
+            if args.spans:
+                instruments.enter_context(recorded_spans())
+            answer = call_solver(solver, puzzle_input=puzzle_input, example=args.example)
+    result = CachedResult(answer=answer, output=output.getvalue() if answer is None else "", seconds=time.perf_counter() - start)
+    if cache_key:
+        cache.put(cache_key, result)
+    return result
+
+
+def solve(args):
+    set_solver_jobs(os.cpu_count() if args.jobs == 0 else args.jobs)
+    # Instrumenting means actually running the solver, so it skips the cache
+    instrumented = args.profile or args.trace_alloc or args.spans
+    cache = None if args.no_cache or instrumented else AnswerCache(max_size=args.cache_size)
+    cache_key = cache.key(args.year, args.puzzle, args.variation, args.example) if cache else None
+    if cached := cache_key and cache.get(cache_key):
+        print(cached.output, end="")
+        print(f"Cached result, originally solved in {cached.seconds:.3f}s")
+        result = cached
+    else:
+        result = _run_and_cache(args, cache, cache_key)
+    if result.answer is not None:
+        print(f"Solution is {result.answer}")
+    if args.time:
+        print(f"Solved in {result.seconds:.3f}s")
+    if args.expect is not None:
+        if result.answer is None:
+            raise ValueError(f"Solver for {args.year}, {args.puzzle}, {args.variation} does not return its answer, cannot verify it")
+        if str(result.answer) != args.expect:
+            print(f"Wrong answer, expected {args.expect}")
+            sys.exit(1)
+
+
+def _selected_solvers(args) -> list[tuple[str, str, str]]:
+    solver_keys = select_solvers(years=args.year, keys=args.puzzle, variations=args.variation)
+    if not solver_keys:
+        raise NotImplementedError(f"No solvers match years {args.year}, puzzles {args.puzzle}, variations {args.variation}")
+    return solver_keys
+
+
+def solve_all(args):
+    solver_keys = _selected_solvers(args)
+    start = time.perf_counter()
+    cache_size = None if args.no_cache else args.cache_size
+    runs = run_all(solver_keys, example=args.example, timeout=args.timeout, jobs=args.jobs, output_dir=args.output_dir, cache_size=cache_size)
+    print_run_table(runs, wall_clock=time.perf_counter() - start)
+
+
+def bench(args):
+    results = bench_solvers(_selected_solvers(args), example=args.example, repeat=args.repeat, warmup=args.warmup, timeout=args.timeout)
+    output_file = write_bench_results(results, args.output)
+    print(f"Results written to {output_file}")
+    if args.update_baseline:
+        updated = update_baseline(results, args.baseline)
+        print(f"Recorded {updated} medians in {args.baseline}")
+
+
+def compare(args):
+    baseline = load_baseline(args.baseline)
+    if args.year or args.puzzle or args.variation:
+        solver_keys = _selected_solvers(args)
+    else:
+        solver_keys = baseline_solvers(baseline, example=args.example)
+    if not solver_keys:
+        raise ValueError(f"Nothing to compare, no solvers selected and none recorded in {args.baseline}")
+    results = bench_solvers(solver_keys, example=args.example, repeat=args.repeat, warmup=args.warmup, timeout=args.timeout)
+    regressions = print_comparisons(compare_to_baseline(results, baseline), threshold=args.threshold, min_delta=args.min_delta)
+    if regressions:
+        sys.exit(1)
+
+
+def _add_selection_arguments(parser: ArgumentParser):
+    parser.add_argument("-y", "--year", action="append", help="only this year, can be repeated")
+    parser.add_argument("-p", "--puzzle", action="append", help="only this puzzle, can be repeated")
+    parser.add_argument("-v", "--variation", action="append", help="only this variation, can be repeated")
+    parser.add_argument("-e", "--example", action="store_true")
+
+
+def _add_cache_arguments(parser: ArgumentParser):
+    parser.add_argument("--no-cache", action="store_true", help="always run the solver, do not read or write the answer cache")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE, help="maximum size of the answer cache in bytes")
+
+
+def _add_bench_arguments(parser: ArgumentParser):
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="timed runs per solver")
+    parser.add_argument("-w", "--warmup", type=int, default=1, help="untimed runs before timing")
+    parser.add_argument("-t", "--timeout", type=float, default=300.0, help="seconds per solver for all runs, 0 to disable")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="baseline file with recorded medians")
+
+
+def main():
+    parser = ArgumentParser(prog="AdventOfCode_solver")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    solve_parser = subparsers.add_parser("solve", help="run a single solver (the default command)")
+    solve_parser.add_argument("-y", "--year", required=True)
+    solve_parser.add_argument("-p", "--puzzle", required=True)
+    solve_parser.add_argument("-v", "--variation", required=True)
+    solve_parser.add_argument("-e", "--example", action="store_true")
+    solve_parser.add_argument("--time", action="store_true", help="report how long the solver took")
+    solve_parser.add_argument("--expect", default=None, help="exit non-zero if the answer differs from this")
+    solve_parser.add_argument("--profile", action="store_true", help="run under cProfile, print a summary and dump the stats to .cache/profiles/")
+    solve_parser.add_argument("--profile-top", type=int, default=30, help="functions shown in the profile summary")
+    solve_parser.add_argument("--trace-alloc", type=int, default=0, metavar="TOP", help="trace allocations and show the TOP sites")
+    solve_parser.add_argument("--spans", action="store_true", help="print the per-phase timings of advent.utils.timing spans")
+    solve_parser.add_argument("-j", "--jobs", type=int, default=None, help="processes solvers may use for parallel work, 0 for cpu count")
+    _add_cache_arguments(solve_parser)
+    solve_parser.set_defaults(handler=solve)
+
+    run_all_parser = subparsers.add_parser("run-all", help="run all matching solvers in parallel")
+    _add_selection_arguments(run_all_parser)
+    run_all_parser.add_argument("-t", "--timeout", type=float, default=60.0, help="seconds per solver, 0 to disable")
+    run_all_parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes, defaults to cpu count")
+    run_all_parser.add_argument("-o", "--output-dir", type=Path, default=None, help="write each solver's output here")
+    _add_cache_arguments(run_all_parser)
+    run_all_parser.set_defaults(handler=solve_all)
+
+    bench_parser = subparsers.add_parser("bench", help="time matching solvers over repeated runs")
+    _add_selection_arguments(bench_parser)
+    _add_bench_arguments(bench_parser)
+    bench_parser.add_argument("-o", "--output", type=Path, default=None, help="JSON file for the results, defaults to .cache/bench/")
+    bench_parser.add_argument("--update-baseline", action="store_true", help="record the medians in the baseline file")
+    bench_parser.set_defaults(handler=bench)
+
+    compare_parser = subparsers.add_parser("compare", help="rerun solvers and fail on regressions against the baseline")
+    _add_selection_arguments(compare_parser)
+    _add_bench_arguments(compare_parser)
+    compare_parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown, 0.25 is 25%%")
+    compare_parser.add_argument("--min-delta", type=float, default=0.005, help="ignore slowdowns smaller than this many seconds")
+    compare_parser.set_defaults(handler=compare)
+
+    arguments = sys.argv[1:]
+    if arguments and arguments[0] not in COMMANDS and arguments[0] not in ["-h", "--help"]:
+        # Keep supporting the original invocation without a command
+        arguments.insert(0, "solve")
+    args = parser.parse_args(arguments)
+    args.handler(args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,91 @@
+import cProfile
+import io
+import pstats
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Generator
+
+from advent.registry import CACHE_DIR
+from advent.utils.timing import enable_spans, disable_spans, print_span_timings
+
+PROFILE_DIR = CACHE_DIR / "profiles"
+
+
+def profile_file(year: str, key: str, variation: str, example: bool) -> Path:
+    example_postfix = "_example" if example else ""
+    return PROFILE_DIR / f"{year}_{key}_{variation}{example_postfix}.pstats"
+
+
+@contextmanager
+def profiled(output_file: Path, top: int) -> Generator[None, None, None]:
+    """ Run the body under cProfile, then dump the raw stats and print the top functions by cumulative time.
+        The dump can be explored further with python -m pstats or snakeviz.
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(output_file)
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+        print(summary.getvalue().rstrip())
+        print(f"Profile written to {output_file}")
+
+
+@contextmanager
+def recorded_spans() -> Generator[None, None, None]:
+    """ Record the spans of advent.utils.timing while running the body, then print the breakdown
+    """
+    enable_spans()
+    try:
+        yield
+    finally:
+        print_span_timings(disable_spans())
+
+
+def _free_monitoring_tool() -> int:
+    # cProfile itself claims the profiler id, so take whichever is unused
+    for tool_id in range(6):
+        if sys.monitoring.get_tool(tool_id) is None:
+            return tool_id
+    raise RuntimeError("No free sys.monitoring tool id")
+
+
+@contextmanager
+def tracing_allocations(function: Callable, top: int) -> Generator[None, None, None]:
+    """ Run the body under tracemalloc and print the source lines holding the most memory when function returns.
+        At that moment everything the solver still references is alive, after it its locals are gone.
+    """
+    snapshots: list[tracemalloc.Snapshot] = []
+
+    def on_return(code, offset, return_value):
+        snapshots.append(tracemalloc.take_snapshot())
+
+    code = getattr(function, "__code__", None)
+    tool_id = _free_monitoring_tool()
+    sys.monitoring.use_tool_id(tool_id, "advent trace-alloc")
+    if code:
+        sys.monitoring.register_callback(tool_id, sys.monitoring.events.PY_RETURN, on_return)
+        sys.monitoring.set_local_events(tool_id, code, sys.monitoring.events.PY_RETURN)
+    tracemalloc.start()
+    try:
+        yield
+    finally:
+        # The last return is the outermost call for recursive functions
+        snapshot = snapshots[-1] if snapshots else tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        if code:
+            sys.monitoring.set_local_events(tool_id, code, 0)
+            sys.monitoring.register_callback(tool_id, sys.monitoring.events.PY_RETURN, None)
+        sys.monitoring.free_tool_id(tool_id)
+        snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+        print(f"Peak traced memory {peak / 1024 / 1024:.2f} MiB, top {top} allocation sites when {function.__name__} returned:")
+        for statistic in snapshot.statistics("lineno")[:top]:
+            frame = statistic.traceback[0]
+            print(f"{statistic.size / 1024:10.1f} KiB {statistic.count:>8} blocks  {frame.filename}:{frame.lineno}")
@@ -1,26 +1,173 @@
+import ast
 import importlib
+import json
+import os
 import pkgutil
 from collections import defaultdict
+from pathlib import Path
 from types import ModuleType
 
 import advent
+from advent.inputs import InputForm
 from advent.utils.solver import SolverFunction
 
 _REGISTERED_SOLVERS: dict[str, dict[str, dict[str, SolverFunction]]] = defaultdict(lambda: defaultdict(dict))
 
+_PACKAGE_DIR = Path(advent.__file__).parent
+CACHE_DIR = _PACKAGE_DIR.parent / ".cache"
+_INDEX_FILE = CACHE_DIR / "solver_index.json"
+_INDEX_VERSION = 1
 
-def register_solver(year: str, key: str, variation: str):
+SolverKey = tuple[str, str, str]
+
+_solver_index: dict[SolverKey, str] | None = None
+_unindexed_modules: list[str] = []
+
+
+def register_solver(year: str, key: str, variation: str, input_form: InputForm = InputForm.LINES):
     def _decorate(solver_func: SolverFunction):
-        if _ := get_solver(year, key, variation):
+        if _ := _lookup_solver(year, key, variation):
             raise ValueError(f"Duplicate key triplet, cannot register: {year}, {key}, {variation} for {solver_func}")
+        solver_func.input_form = input_form
         _REGISTERED_SOLVERS[year][key][variation] = solver_func
         return solver_func
     return _decorate
 
 
-def get_solver(year: str, key: str, variation: str) -> SolverFunction:
-    solver = _REGISTERED_SOLVERS.get(year, {}).get(key, {}).get(variation, None)
-    return solver
+def _lookup_solver(year: str, key: str, variation: str) -> SolverFunction | None:
+    return _REGISTERED_SOLVERS.get(year, {}).get(key, {}).get(variation, None)
+
+
+def get_solver(year: str, key: str, variation: str) -> SolverFunction | None:
+    """ Return the solver for the given triplet, importing only the module that registers it
+    """
+    if solver := _lookup_solver(year, key, variation):
+        return solver
+    if module_name := solver_index().get((year, key, variation)):
+        importlib.import_module(module_name)
+        return _lookup_solver(year, key, variation)
+    for module_name in _unindexed_modules:
+        importlib.import_module(module_name)
+    return _lookup_solver(year, key, variation)
+
+
+def registered_solver_keys() -> list[SolverKey]:
+    """ All known (year, key, variation) triplets, in natural order, without importing any solver
+    """
+    def _natural(solver_key: SolverKey) -> tuple:
+        return tuple((0, int(part), "") if part.isdigit() else (1, 0, part) for part in solver_key)
+    keys = set(solver_index())
+    if _unindexed_modules:
+        import_all_solvers()
+    keys.update((year, key, variation)
+                for year, keys_for_year in _REGISTERED_SOLVERS.items()
+                for key, variations in keys_for_year.items()
+                for variation in variations)
+    return sorted(keys, key=_natural)
+
+
+def _module_name(path: Path) -> str:
+    parts = list(path.relative_to(_PACKAGE_DIR.parent).with_suffix("").parts)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def _literal_arguments(call: ast.Call) -> SolverKey | None:
+    """ Resolve the year, key and variation of a register_solver(...) decorator, if they are literal strings
+    """
+    arguments = dict(zip(("year", "key", "variation"), call.args))
+    arguments.update((keyword.arg, keyword.value) for keyword in call.keywords)
+    try:
+        values = tuple(ast.literal_eval(arguments[name]) for name in ("year", "key", "variation"))
+    except (KeyError, ValueError):
+        return None
+    if all(isinstance(value, str) for value in values):
+        return values
+    return None
+
+
+def _scan_module(path: Path) -> list[SolverKey] | None:
+    """ Find all solvers registered in the given source file without importing it.
+        Returns None if the file registers a solver whose key cannot be determined statically.
+    """
+    tree = ast.parse(path.read_bytes(), filename=str(path))
+    solvers = []
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for decorator in node.decorator_list:
+            if not isinstance(decorator, ast.Call):
+                continue
+            func = decorator.func
+            name = func.id if isinstance(func, ast.Name) else getattr(func, "attr", None)
+            if name != "register_solver":
+                continue
+            if solver_key := _literal_arguments(decorator):
+                solvers.append(solver_key)
+            else:
+                return None
+    return solvers
+
+
+def _read_index_file() -> dict:
+    try:
+        with open(_INDEX_FILE, "rt") as file:
+            content = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if content.get("version") != _INDEX_VERSION:
+        return {}
+    return content.get("modules", {})
+
+
+def _write_index_file(modules: dict):
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        temp_file = _INDEX_FILE.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_file, "wt") as file:
+            json.dump({"version": _INDEX_VERSION, "modules": modules}, file, indent=1, sort_keys=True)
+        os.replace(temp_file, _INDEX_FILE)
+    except OSError:
+        # A read-only checkout still works, it just rescans on every start
+        pass
+
+
+def build_solver_index() -> dict[SolverKey, str]:
+    """ Map every (year, key, variation) to the module registering it.
+        The index is kept on disk and only files whose mtime or size changed are parsed again.
+    """
+    previous = _read_index_file()
+    modules = {}
+    for path in sorted(_PACKAGE_DIR.rglob("*.py")):
+        stat = path.stat()
+        module_name = _module_name(path)
+        entry = previous.get(module_name)
+        if not entry or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+            entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "solvers": _scan_module(path)}
+        modules[module_name] = entry
+    if modules != previous:
+        _write_index_file(modules)
+
+    index = {}
+    _unindexed_modules.clear()
+    for module_name, entry in modules.items():
+        if entry["solvers"] is None:
+            # Cannot be resolved statically, these get imported on a lookup miss
+            _unindexed_modules.append(module_name)
+            continue
+        for year, key, variation in entry["solvers"]:
+            if (other_module := index.get((year, key, variation))) and other_module != module_name:
+                raise ValueError(f"Duplicate key triplet, cannot register: {year}, {key}, {variation} in {module_name} and {other_module}")
+            index[(year, key, variation)] = module_name
+    return index
+
+
+def solver_index() -> dict[SolverKey, str]:
+    global _solver_index
+    if _solver_index is None:
+        _solver_index = build_solver_index()
+    return _solver_index
 
 
 def _import_submodules(package: str | ModuleType, recursive=True) -> dict[str, ModuleType]:
@@ -0,0 +1,144 @@
+import io
+import os
+import signal
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager, redirect_stdout, redirect_stderr
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+
+from advent.cache import AnswerCache, CachedResult
+from advent.inputs import input_path, open_input, input_form_of
+from advent.registry import SolverKey, get_solver, registered_solver_keys
+from advent.utils.solver import Answer, call_solver, set_solver_jobs
+
+
+class SolverTimeout(BaseException):
+    """ Raised inside a worker when a solver exceeds its time budget.
+        Derives from BaseException so solvers catching Exception cannot swallow it.
+    """
+
+
+class RunStatus(Enum):
+    OK = "ok"
+    CACHED = "cached"
+    FAILED = "failed"
+    TIMEOUT = "timeout"
+    NO_INPUT = "no input"
+
+
+@dataclass
+class SolverRun:
+    year: str
+    key: str
+    variation: str
+    status: RunStatus
+    seconds: float
+    stdout: str
+    answer: Answer | None = None
+    error: str = ""
+
+    @property
+    def summary(self) -> str:
+        if self.error:
+            return self.error
+        if self.answer is not None:
+            return f"answer: {self.answer}"
+        lines = self.stdout.rstrip().splitlines()
+        return lines[-1] if lines else ""
+
+
+def select_solvers(years: list[str] | None = None,
+                   keys: list[str] | None = None,
+                   variations: list[str] | None = None) -> list[SolverKey]:
+    return [(year, key, variation)
+            for year, key, variation in registered_solver_keys()
+            if (not years or year in years) and (not keys or key in keys) and (not variations or variation in variations)]
+
+
+def _raise_timeout(signum, frame):
+    raise SolverTimeout()
+
+
+@contextmanager
+def time_limit(seconds: float | None):
+    """ Raise SolverTimeout in the main thread once the given number of seconds has passed.
+        Without a limit, or on platforms lacking setitimer, this does nothing.
+    """
+    if not seconds or not hasattr(signal, "setitimer"):
+        yield
+        return
+    previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+def run_solver(year: str, key: str, variation: str, example: bool, timeout: float | None, cache_size: int | None = None) -> SolverRun:
+    """ Run a single solver with its stdout captured, meant to be executed in a worker process.
+        Without a cache_size the answer cache is not used.
+    """
+    if not input_path(year, key, example).exists():
+        return SolverRun(year, key, variation, RunStatus.NO_INPUT, 0.0, "")
+    cache = AnswerCache(max_size=cache_size) if cache_size else None
+    cache_key = cache.key(year, key, variation, example) if cache else None
+    if cached := cache_key and cache.get(cache_key):
+        return SolverRun(year, key, variation, RunStatus.CACHED, cached.seconds, cached.output, cached.answer)
+
+    solver = get_solver(year, key, variation)
+    # Every worker already has a core, pools inside the solvers would only multiply the processes
+    set_solver_jobs(None)
+    stdout = io.StringIO()
+    status, answer, error = RunStatus.OK, None, ""
+    with open_input(year, key, example, input_form_of(solver)) as puzzle_input:
+        start = time.perf_counter()
+        try:
+            with time_limit(timeout), redirect_stdout(stdout), redirect_stderr(stdout):
+                answer = call_solver(solver, puzzle_input=puzzle_input, example=example)
+        except SolverTimeout:
+            status = RunStatus.TIMEOUT
+        except Exception as e:
+            status, error = RunStatus.FAILED, "".join(traceback.format_exception_only(e)).strip()
+        seconds = time.perf_counter() - start
+    if cache_key and status == RunStatus.OK:
+        cache.put(cache_key, CachedResult(answer=answer, output=stdout.getvalue() if answer is None else "", seconds=seconds))
+    return SolverRun(year, key, variation, status, seconds, stdout.getvalue(), answer, error)
+
+
+def run_all(solver_keys: list[SolverKey],
+            example: bool,
+            timeout: float | None,
+            jobs: int | None = None,
+            output_dir: Path | None = None,
+            cache_size: int | None = None) -> list[SolverRun]:
+    runs: dict[SolverKey, SolverRun] = {}
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        futures = {executor.submit(run_solver, *solver_key, example, timeout, cache_size): solver_key for solver_key in solver_keys}
+        for future in as_completed(futures):
+            solver_key = futures[future]
+            try:
+                run = future.result()
+            except Exception as e:
+                # The worker itself died, e.g. out of memory
+                run = SolverRun(*solver_key, RunStatus.FAILED, 0.0, "", error=repr(e))
+            runs[solver_key] = run
+            print(f"{run.year:>8} {run.key:>7} {run.variation:>3}  {run.status.value}", flush=True)
+            if output_dir and run.status != RunStatus.NO_INPUT:
+                output_dir.mkdir(parents=True, exist_ok=True)
+                (output_dir / f"{run.year}_{run.key}_{run.variation}.txt").write_text(run.stdout)
+    return [runs[solver_key] for solver_key in solver_keys]
+
+
+def print_run_table(runs: list[SolverRun], wall_clock: float):
+    print()
+    print(f"{'year':>8} {'puzzle':>7} {'var':>3}  {'status':<8} {'seconds':>9}  answer or last output line")
+    for run in runs:
+        print(f"{run.year:>8} {run.key:>7} {run.variation:>3}  {run.status.value:<8} {run.seconds:>9.3f}  {run.summary[:80]}")
+    counts = {status: sum(1 for run in runs if run.status == status) for status in RunStatus}
+    summary = ", ".join(f"{count} {status.value}" for status, count in counts.items() if count)
+    print(f"\n{len(runs)} solvers ({summary}) in {wall_clock:.2f}s wall clock, {sum(run.seconds for run in runs):.2f}s solver time")
@@ -0,0 +1,168 @@
+from typing import Generic, Callable, Iterable, Self
+
+from advent.utils.enums import Direction
+from advent.utils.grid import Grid, CompactGrid, T
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Offsets (dx, dy) as used by Direction.next_coords
+_OFFSETS = {
+    Direction.EAST: (1, 0),
+    Direction.WEST: (-1, 0),
+    Direction.NORTH: (0, -1),
+    Direction.SOUTH: (0, 1),
+}
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError("NumPy is not installed, it is an optional dependency: pip install '.[numpy]'")
+
+
+class ArrayGrid(Generic[T]):
+    """ Grid stored as a 2D numpy array of palette indices, indexed [y, x] like Grid.tiles.
+        Meant for whole-board passes: masks, shifted neighbours, labelling and flood fills run as array operations.
+        The palette is the one of CompactGrid, so enum tiles are stored as their ordinals.
+    """
+    def __init__(self, cells: "np.ndarray", palette: list[T]):
+        require_numpy()
+        self.cells = cells
+        self.palette = palette
+        self.height, self.width = cells.shape
+        self._index: dict[T, int] = {tile: index for index, tile in enumerate(palette)}
+
+    @classmethod
+    def from_grid(cls, grid: Grid[T]) -> Self:
+        require_numpy()
+        if not isinstance(grid, CompactGrid):
+            grid = CompactGrid(grid.tiles)
+        cells = np.frombuffer(grid.snapshot(), dtype=np.uint8).reshape(grid.height, grid.width).copy()
+        return cls(cells, list(grid.palette))
+
+    @classmethod
+    def from_tiles(cls, tiles: list[list[T]]) -> Self:
+        return cls.from_grid(CompactGrid(tiles))
+
+    @classmethod
+    def from_lines(cls, lines: list[str], converter_function: Callable[[str], T]) -> Self:
+        return cls.from_grid(CompactGrid.from_lines(lines, converter_function))
+
+    @property
+    def tiles(self) -> list[list[T]]:
+        """ New list of lists in the layout of Grid.tiles
+        """
+        palette = self.palette
+        return [[palette[cell] for cell in row] for row in self.cells.tolist()]
+
+    def to_grid(self) -> Grid[T]:
+        return Grid(self.tiles)
+
+    def to_compact_grid(self) -> CompactGrid[T]:
+        return CompactGrid.from_cells(self.cells.astype(np.uint8).tobytes(), self.width, self.palette)
+
+    def index_of(self, value: T) -> int:
+        if (index := self._index.get(value)) is None:
+            if len(self.palette) == 256:
+                raise ValueError(f"ArrayGrid supports at most 256 distinct tiles, cannot add {value}")
+            index = len(self.palette)
+            self.palette.append(value)
+            self._index[value] = index
+        return index
+
+    def value_at(self, x: int, y: int) -> T:
+        return self.palette[self.cells[y, x]]
+
+    def set_value_at(self, x: int, y: int, value: T):
+        self.cells[y, x] = self.index_of(value)
+
+    def mask(self, *values: T) -> "np.ndarray":
+        """ Boolean array, True where the tile is one of values
+        """
+        return np.isin(self.cells, [self.index_of(value) for value in values])
+
+    def lookup(self, table: Callable[[T], int | bool], dtype=bool) -> "np.ndarray":
+        """ Array of table(tile) for every cell, table is only called once per palette entry
+        """
+        return np.array([table(tile) for tile in self.palette], dtype=dtype)[self.cells]
+
+    def fill(self, mask: "np.ndarray", value: T):
+        self.cells[mask] = self.index_of(value)
+
+    def all_coords_for(self, values: set[T]) -> Iterable[tuple[int, int]]:
+        ys, xs = np.nonzero(self.mask(*values))
+        return zip(xs.tolist(), ys.tolist())
+
+
+def shifted(array: "np.ndarray", direction: Direction, fill=0) -> "np.ndarray":
+    """ result[y, x] is array at direction.next_coords(x, y), or fill when that lies outside the array
+    """
+    dx, dy = _OFFSETS[direction]
+    height, width = array.shape
+    result = np.full_like(array, fill)
+    result[max(0, -dy):height - max(0, dy), max(0, -dx):width - max(0, dx)] = \
+        array[max(0, dy):height - max(0, -dy), max(0, dx):width - max(0, -dx)]
+    return result
+
+
+def neighbour_count(mask: "np.ndarray", directions: Iterable[Direction] = Direction.all()) -> "np.ndarray":
+    """ Number of neighbours in the given directions where mask is True
+    """
+    count = np.zeros(mask.shape, dtype=np.uint8)
+    for direction in directions:
+        count += shifted(mask, direction, fill=False)
+    return count
+
+
+def border_mask(shape: tuple[int, int]) -> "np.ndarray":
+    mask = np.ones(shape, dtype=bool)
+    mask[1:-1, 1:-1] = False
+    return mask
+
+
+def label_components(values: "np.ndarray", mask: "np.ndarray | None" = None) -> tuple["np.ndarray", int]:
+    """ Label 4-connected areas of equal values, only cells where mask is True take part.
+        Returns labels 1..count numbered in row-major order of their first cell, 0 outside the mask.
+        Every round hooks each tree root onto the smallest root it touches, then pointer jumping flattens the trees.
+    """
+    require_numpy()
+    height, width = values.shape
+    if mask is None:
+        mask = np.ones(values.shape, dtype=bool)
+    flat_index = np.arange(height * width).reshape(height, width)
+    horizontal = (values[:, 1:] == values[:, :-1]) & mask[:, 1:] & mask[:, :-1]
+    vertical = (values[1:, :] == values[:-1, :]) & mask[1:, :] & mask[:-1, :]
+    first = np.concatenate((flat_index[:, :-1][horizontal], flat_index[:-1, :][vertical]))
+    second = np.concatenate((flat_index[:, 1:][horizontal], flat_index[1:, :][vertical]))
+    parent = flat_index.ravel().copy()
+    while True:
+        first_root, second_root = parent[first], parent[second]
+        different = first_root != second_root
+        if not different.any():
+            break
+        # Roots only ever point to smaller indices, so every tree root is the first cell of its component in the end
+        np.minimum.at(parent, np.maximum(first_root, second_root)[different], np.minimum(first_root, second_root)[different])
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+    roots = parent.reshape(height, width)
+    labels = np.zeros(values.shape, dtype=np.int32)
+    unique_roots, inverse = np.unique(roots[mask], return_inverse=True)
+    labels[mask] = inverse.ravel() + 1
+    return labels, len(unique_roots)
+
+
+def flood_fill(passable: "np.ndarray", seeds: "np.ndarray") -> "np.ndarray":
+    """ Boolean array of the passable cells 4-connected to any passable seed
+    """
+    labels, _ = label_components(passable, mask=passable)
+    seed_labels = np.unique(labels[seeds & passable])
+    return np.isin(labels, seed_labels) & passable
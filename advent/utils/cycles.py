@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, TypeVar
+
+S = TypeVar("S")
+
+# Returns the next state, or None when it changed the state in place
+StepFunction = Callable[[S], S | None]
+
+
+@dataclass
+class CycleSearch(Generic[S]):
+    state: S
+    # Steps taken to reach state
+    steps: int
+    # state is on a cycle of this length, None when no repeat was seen within the allowed steps
+    cycle_length: int | None
+
+
+def _advance(state: S, step: StepFunction) -> S:
+    next_state = step(state)
+    return state if next_state is None else next_state
+
+
+def detect_cycle(state: S, step: StepFunction, fingerprint: Callable[[S], Hashable] = lambda state: state,
+                 max_steps: int | None = None) -> CycleSearch[S]:
+    """ Brent's algorithm, run on a single copy of the state. Only the fingerprint of the last power-of-two
+        checkpoint is kept, so memory does not grow with the number of steps before the cycle.
+        The fingerprint must be equal exactly when the states are, and should be cheap to compare.
+    """
+    checkpoint = fingerprint(state)
+    power = cycle_length = 1
+    steps = 0
+    while max_steps is None or steps < max_steps:
+        state = _advance(state, step)
+        steps += 1
+        current = fingerprint(state)
+        if current == checkpoint:
+            return CycleSearch(state, steps, cycle_length)
+        if power == cycle_length:
+            checkpoint = current
+            power *= 2
+            cycle_length = 0
+        cycle_length += 1
+    return CycleSearch(state, steps, None)
+
+
+def fast_forward(state: S, step: StepFunction, steps: int, fingerprint: Callable[[S], Hashable] = lambda state: state) -> S:
+    """ The state after applying step steps times, skipping all complete cycles once one has been found
+    """
+    search = detect_cycle(state, step, fingerprint, max_steps=steps)
+    state = search.state
+    remaining = steps - search.steps
+    if search.cycle_length:
+        remaining %= search.cycle_length
+    for _ in range(remaining):
+        state = _advance(state, step)
+    return state
@@ -1,6 +1,8 @@
+from array import array
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import Self, Callable, Generator
+from typing import Self, Callable, Generator, Hashable, Iterable, Iterator
 
 
 class Vertex:
@@ -8,17 +10,28 @@ class Vertex:
         self.ident = ident
         self.edges: list["Edge"] = []
         self.coords = (x, y)
+        # (start ident, end ident) of every edge, so adding an edge does not scan all edges for duplicates
+        self._edge_keys: set[tuple[str, str]] = set()
+
+    def _has_edge(self, start_ident: str, end_ident: str) -> bool:
+        if len(self._edge_keys) != len(self.edges):
+            # Edges were appended to the list directly
+            self._edge_keys = {(edge.start_vertex.ident, edge.end_vertex.ident) for edge in self.edges}
+        return (start_ident, end_ident) in self._edge_keys
+
+    def _append_edge(self, edge: "Edge"):
+        self.edges.append(edge)
+        self._edge_keys.add((edge.start_vertex.ident, edge.end_vertex.ident))
 
     def add_unidirectional_edge(self, other_vertex: Self, weight: int):
-        if not any(edge.end_vertex == other_vertex for edge in self.edges):
-            new_edge = Edge(start_vertex=self, end_vertex=other_vertex, weight=weight)
-            self.edges.append(new_edge)
+        if not self._has_edge(self.ident, other_vertex.ident):
+            self._append_edge(Edge(start_vertex=self, end_vertex=other_vertex, weight=weight))
 
     def add_bidirectional_edge(self, other_vertex: Self, weight: int):
-        if not any(edge.between(self, other_vertex) for edge in self.edges):
+        if not self._has_edge(self.ident, other_vertex.ident) and not self._has_edge(other_vertex.ident, self.ident):
             new_edge = Edge(start_vertex=self, end_vertex=other_vertex, weight=weight)
-            self.edges.append(new_edge)
-            other_vertex.edges.append(~new_edge)
+            self._append_edge(new_edge)
+            other_vertex._append_edge(~new_edge)
 
     def __repr__(self) -> str:
         return f"Vertex(id={self.ident}, coords={self.coords}, edges: {self.edges})"
@@ -49,7 +62,7 @@ class Edge:
         return Edge(start_vertex=self.end_vertex, end_vertex=self.start_vertex, weight=self.weight)
 
     def __hash__(self):
-        return hash((self.start_vertex, self.end_vertex, self.weight))
+        return hash((self.start_vertex.ident, self.end_vertex.ident, self.weight))
 
 
 @dataclass
@@ -84,3 +97,316 @@ def find_all_paths(start_path: VertexPath, path_finished_function: Callable[[Ver
         for edge in path.current_vertex.edges:
             if edge.end_vertex not in path.visited:
                 paths.append(path.move_to(edge.end_vertex))
+
+
+class CSRGraph:
+    """ Directed graph over vertices numbered 0 up to vertex_count, stored as flat arrays (compressed sparse rows).
+        The edges leaving vertex v are at positions offsets[v] up to offsets[v + 1] of targets and weights.
+        Undirected graphs store every edge in both directions.
+    """
+    def __init__(self, offsets: array, targets: array, weights: array, idents: list[Hashable]):
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.idents = idents
+        self._index: dict[Hashable, int] = {ident: vertex for vertex, ident in enumerate(idents)}
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def index(self, ident: Hashable) -> int:
+        return self._index[ident]
+
+    def degree(self, vertex: int) -> int:
+        return self.offsets[vertex + 1] - self.offsets[vertex]
+
+    def neighbours(self, vertex: int) -> array:
+        return self.targets[self.offsets[vertex]:self.offsets[vertex + 1]]
+
+    def edges(self, vertex: int) -> Iterator[tuple[int, int]]:
+        """ (target, weight) of every edge leaving vertex
+        """
+        start, end = self.offsets[vertex], self.offsets[vertex + 1]
+        return zip(self.targets[start:end], self.weights[start:end])
+
+    def topological_order(self) -> list[int]:
+        in_degrees = array("q", bytes(8 * self.vertex_count))
+        for target in self.targets:
+            in_degrees[target] += 1
+        order = [vertex for vertex in range(self.vertex_count) if not in_degrees[vertex]]
+        for vertex in order:
+            for target in self.neighbours(vertex):
+                in_degrees[target] -= 1
+                if not in_degrees[target]:
+                    order.append(target)
+        if len(order) != self.vertex_count:
+            raise ValueError("Graph contains a cycle, there is no topological order")
+        return order
+
+    @classmethod
+    def from_vertices(cls, vertices: Iterable[Vertex]) -> Self:
+        """ Every edge in the edge list of a vertex counts as leaving that vertex, towards its other end
+        """
+        builder = GraphBuilder()
+        vertices = list(vertices)
+        for vertex in vertices:
+            builder.vertex(vertex.ident)
+        for vertex in vertices:
+            for edge in vertex.edges:
+                other_vertex = edge.end_vertex if edge.start_vertex == vertex else edge.start_vertex
+                builder.add_edge(vertex.ident, other_vertex.ident, edge.weight)
+        return builder.build()
+
+
+class GraphBuilder:
+    """ Collects edges between hashable idents and builds a CSRGraph, removing duplicate edges in one sort
+    """
+    def __init__(self):
+        self.idents: list[Hashable] = []
+        self._index: dict[Hashable, int] = {}
+        self._sources = array("q")
+        self._targets = array("q")
+        self._weights = array("q")
+
+    def vertex(self, ident: Hashable) -> int:
+        if (index := self._index.get(ident)) is None:
+            index = self._index[ident] = len(self.idents)
+            self.idents.append(ident)
+        return index
+
+    def add_edge(self, source: Hashable, target: Hashable, weight: int = 1):
+        self._sources.append(self.vertex(source))
+        self._targets.append(self.vertex(target))
+        self._weights.append(weight)
+
+    def add_bidirectional_edge(self, source: Hashable, target: Hashable, weight: int = 1):
+        self.add_edge(source, target, weight)
+        self.add_edge(target, source, weight)
+
+    def build(self) -> CSRGraph:
+        """ Of duplicate edges only the first one added is kept, like Vertex.add_unidirectional_edge does
+        """
+        sources, targets = self._sources, self._targets
+        # sorted is stable, so the first added edge comes first among its duplicates
+        order = sorted(range(len(sources)), key=lambda edge: (sources[edge], targets[edge]))
+        offsets = array("q", bytes(8 * (len(self.idents) + 1)))
+        kept_targets, kept_weights = array("q"), array("q")
+        previous = None
+        for edge in order:
+            key = (sources[edge], targets[edge])
+            if key != previous:
+                offsets[key[0] + 1] += 1
+                kept_targets.append(key[1])
+                kept_weights.append(self._weights[edge])
+                previous = key
+        for vertex in range(len(self.idents)):
+            offsets[vertex + 1] += offsets[vertex]
+        return CSRGraph(offsets, kept_targets, kept_weights, list(self.idents))
+
+
+def _longest_from(adjacency: list[tuple[tuple[int, int], ...]], best_in: list[int], target: int,
+                  vertex: int, visited: int, length: int, remaining: int) -> int:
+    """ Depth first search over simple paths, visited is a bitmask of vertices.
+        remaining is the sum of best_in over the unvisited vertices: every vertex still to be entered
+        adds at most its heaviest incoming edge, so paths that cannot beat the best one are cut off.
+    """
+    best = -1
+
+    def extend(vertex: int, visited: int, length: int, remaining: int):
+        nonlocal best
+        if vertex == target:
+            if length > best:
+                best = length
+            return
+        if length + remaining <= best:
+            return
+        for next_vertex, weight in adjacency[vertex]:
+            bit = 1 << next_vertex
+            if not visited & bit:
+                extend(next_vertex, visited | bit, length + weight, remaining - best_in[next_vertex])
+
+    extend(vertex, visited, length, remaining)
+    return best
+
+
+def _longest_from_prefix(arguments: tuple) -> int:
+    return _longest_from(*arguments)
+
+
+def longest_simple_path(graph: CSRGraph, start: int, target: int, jobs: int | None = None) -> int | None:
+    """ Length of the longest path from start to target that visits no vertex twice, None when there is none.
+        With jobs above one the first levels of the search are expanded and the subtrees searched in a process pool.
+    """
+    adjacency = [tuple(graph.edges(vertex)) for vertex in range(graph.vertex_count)]
+    best_in = [0] * graph.vertex_count
+    for vertex in range(graph.vertex_count):
+        for next_vertex, weight in adjacency[vertex]:
+            best_in[next_vertex] = max(best_in[next_vertex], weight)
+    into_target = [vertex for vertex in range(graph.vertex_count) if target in graph.neighbours(vertex)]
+    if len(into_target) == 1:
+        # The only way into the target, leaving it any other way means the target can never be reached
+        funnel = into_target[0]
+        adjacency[funnel] = tuple((next_vertex, weight) for next_vertex, weight in adjacency[funnel] if next_vertex == target)
+    prefixes = [(start, 1 << start, 0, sum(best_in) - best_in[start])]
+    if jobs and jobs > 1:
+        # Expand breadth first until there is enough work to spread over the workers
+        while prefixes and len(prefixes) < 4 * jobs:
+            expanded = []
+            for vertex, visited, length, remaining in prefixes:
+                if vertex == target:
+                    expanded.append((vertex, visited, length, remaining))
+                    continue
+                for next_vertex, weight in adjacency[vertex]:
+                    if not visited & (1 << next_vertex):
+                        expanded.append((next_vertex, visited | 1 << next_vertex, length + weight, remaining - best_in[next_vertex]))
+            if len(expanded) <= len(prefixes):
+                break
+            prefixes = expanded
+    if len(prefixes) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            best = max(executor.map(_longest_from_prefix, [(adjacency, best_in, target, *prefix) for prefix in prefixes]))
+    else:
+        best = max(_longest_from(adjacency, best_in, target, *prefix) for prefix in prefixes) if prefixes else -1
+    return None if best < 0 else best
+
+
+def adjacency_bitsets(graph: CSRGraph) -> list[int]:
+    """ Neighbours of every vertex as an int with bit n set for vertex n, for undirected graphs stored both ways
+    """
+    bitsets = [0] * graph.vertex_count
+    for vertex in range(graph.vertex_count):
+        bitset = 0
+        for target in graph.neighbours(vertex):
+            bitset |= 1 << target
+        bitsets[vertex] = bitset
+    return bitsets
+
+
+def _bits(bitset: int) -> Iterator[int]:
+    while bitset:
+        lowest = bitset & -bitset
+        yield lowest.bit_length() - 1
+        bitset ^= lowest
+
+
+def degeneracy_order(graph: CSRGraph) -> list[int]:
+    """ Repeatedly takes out a vertex of minimum degree among the ones left, using buckets per degree.
+        Every vertex then has at most degeneracy neighbours later in the order.
+    """
+    degrees = [graph.degree(vertex) for vertex in range(graph.vertex_count)]
+    buckets: list[set[int]] = [set() for _ in range(max(degrees, default=0) + 1)]
+    for vertex, degree in enumerate(degrees):
+        buckets[degree].add(vertex)
+    removed = bytearray(graph.vertex_count)
+    order = []
+    lowest = 0
+    for _ in range(graph.vertex_count):
+        # Removing a vertex lowers the degree of its neighbours by one at most
+        lowest = max(lowest - 1, 0)
+        while not buckets[lowest]:
+            lowest += 1
+        vertex = buckets[lowest].pop()
+        removed[vertex] = 1
+        order.append(vertex)
+        for neighbour in graph.neighbours(vertex):
+            if not removed[neighbour]:
+                buckets[degrees[neighbour]].remove(neighbour)
+                degrees[neighbour] -= 1
+                buckets[degrees[neighbour]].add(neighbour)
+    return order
+
+
+def triangles(adjacency: list[int], order: list[int]) -> Generator[tuple[int, int, int], None, None]:
+    """ Every triangle once, as its vertex earliest in the given order followed by the other two by index.
+        With a degeneracy order only few neighbours come later.
+    """
+    later = (1 << len(adjacency)) - 1
+    for vertex in order:
+        later ^= 1 << vertex
+        later_neighbours = adjacency[vertex] & later
+        for second in _bits(later_neighbours):
+            # Bits above second to list each triangle once
+            for third in _bits(later_neighbours & adjacency[second] & ~((2 << second) - 1)):
+                yield vertex, second, third
+
+
+def maximum_clique(adjacency: list[int], order: list[int]) -> list[int]:
+    """ Bron–Kerbosch with Tomita pivoting, started from every vertex in the given order with only its later
+        neighbours as candidates. Branches that cannot beat the best clique found so far are cut off.
+    """
+    best: list[int] = []
+
+    def extend(clique: list[int], candidates: int, excluded: int):
+        nonlocal best
+        if not candidates:
+            if not excluded and len(clique) > len(best):
+                best = list(clique)
+            return
+        if len(clique) + candidates.bit_count() <= len(best):
+            return
+        pivot = max(_bits(candidates | excluded), key=lambda vertex: (candidates & adjacency[vertex]).bit_count())
+        for vertex in _bits(candidates & ~adjacency[pivot]):
+            bit = 1 << vertex
+            clique.append(vertex)
+            extend(clique, candidates & adjacency[vertex], excluded & adjacency[vertex])
+            clique.pop()
+            candidates ^= bit
+            excluded |= bit
+
+    later = (1 << len(adjacency)) - 1
+    for vertex in order:
+        later ^= 1 << vertex
+        extend([vertex], adjacency[vertex] & later, adjacency[vertex] & ~later)
+    return best
+
+
+def strongly_connected_components(successors: list[list[int]]) -> list[list[int]]:
+    """ Tarjan's algorithm with an explicit stack instead of recursion. Components come out in reverse topological
+        order: every component after all the components it can reach.
+    """
+    vertex_count = len(successors)
+    indices = [-1] * vertex_count
+    lows = [0] * vertex_count
+    on_stack = bytearray(vertex_count)
+    stack: list[int] = []
+    components: list[list[int]] = []
+    counter = 0
+    for root in range(vertex_count):
+        if indices[root] != -1:
+            continue
+        # Vertex and the position in its successors to continue from
+        work = [(root, 0)]
+        while work:
+            vertex, position = work.pop()
+            if position == 0:
+                indices[vertex] = lows[vertex] = counter
+                counter += 1
+                stack.append(vertex)
+                on_stack[vertex] = 1
+            for next_position in range(position, len(successors[vertex])):
+                target = successors[vertex][next_position]
+                if indices[target] == -1:
+                    work.append((vertex, next_position + 1))
+                    work.append((target, 0))
+                    break
+                if on_stack[target]:
+                    lows[vertex] = min(lows[vertex], indices[target])
+            else:
+                if lows[vertex] == indices[vertex]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        component.append(member)
+                        if member == vertex:
+                            break
+                    components.append(component)
+                if work:
+                    parent = work[-1][0]
+                    lows[parent] = min(lows[parent], lows[vertex])
+    return components
@@ -1,9 +1,9 @@
-import sys
-from collections import deque, namedtuple
+from collections import namedtuple
 from copy import deepcopy
+from enum import Enum
 from typing import Generic, Self, Callable, Generator, TypeVar
 
-from advent.utils.enums import Direction
+from advent.utils.pathfinding import bfs, grid_neighbours, UNREACHED
 
 T = TypeVar("T")
 
@@ -17,13 +17,13 @@ class Grid(Generic[T]):
     def copy(self) -> Self:
         return self.__class__(deepcopy(self.tiles))
 
-    @staticmethod
-    def from_size(width: int, height: int, tile: T) -> Self:
-        return Grid(tiles=[[tile for _ in range(width)] for _ in range(height)])
+    @classmethod
+    def from_size(cls, width: int, height: int, tile: T) -> Self:
+        return cls(tiles=[[tile for _ in range(width)] for _ in range(height)])
 
-    @staticmethod
-    def from_lines(lines: list[str], converter_function: Callable[[str], T]) -> Self:
-        return Grid(tiles=[[converter_function(char) for char in line] for line in lines])
+    @classmethod
+    def from_lines(cls, lines: list[str], converter_function: Callable[[str], T]) -> Self:
+        return cls(tiles=[[converter_function(char) for char in line] for line in lines])
 
     def within_bounds(self, x: int, y: int) -> bool:
         return 0 <= x < self.width and 0 <= y < self.height
@@ -31,29 +31,29 @@ class Grid(Generic[T]):
     def value_at(self, x: int, y: int) -> T:
         return self.tiles[y][x]
 
+    # The bounds checks below are inlined, these are the hottest methods of most grid solvers
     def value_at_or(self, x: int, y: int, default: T | None = None) -> T | None:
-        if self.within_bounds(x, y):
+        if 0 <= x < self.width and 0 <= y < self.height:
             return self.tiles[y][x]
         else:
             return default
 
     def set_value_at(self, x: int, y: int, value: T):
-        if self.within_bounds(x, y):
+        if 0 <= x < self.width and 0 <= y < self.height:
             self.tiles[y][x] = value
         else:
             raise KeyError(f"Invalid coordinates {x}, {y} for grid with width {self.width} and height {self.height}")
 
     @property
     def coords_iterator(self) -> Generator[tuple[int, int, T], None, None]:
-        for y in range(0, self.height):
-            for x in range(0, self.width):
-                yield x, y, self.value_at(x, y)
+        for y, row in enumerate(self.tiles):
+            for x, tile in enumerate(row):
+                yield x, y, tile
 
     @property
     def tiles_iterator(self) -> Generator[T, None, None]:
-        for y in range(0, self.height):
-            for x in range(0, self.width):
-                yield self.value_at(x, y)
+        for row in self.tiles:
+            yield from row
 
     def print_grid(self, print_function: Callable[[T], str]):
         for y in range(0, self.height):
@@ -64,27 +64,162 @@ class Grid(Generic[T]):
             print("".join(print_function(x, y, tile) for x, tile in enumerate(self.tiles[y])))
 
     def all_coords_for(self, values: set[T]) -> Generator[tuple[int, int], None, None]:
-        for x, y, tile in self.coords_iterator:
-            if tile in values:
-                yield x, y
+        for y, row in enumerate(self.tiles):
+            for x, tile in enumerate(row):
+                if tile in values:
+                    yield x, y
+
+
+class CompactGrid(Grid[T]):
+    """ Grid storing every tile as one byte in a flat row-major bytearray, indexing a palette of at most 256 values.
+        For enums the palette starts out as all members in definition order, so the bytes are their ordinals.
+        A copy shares the bytearray with its original until either of them is written to.
+    """
+    def __init__(self, tiles: list[list[T]]):
+        height = len(tiles)
+        width = len(tiles[0])
+        self._init_palette(tiles[0][0])
+        cells = bytearray(width * height)
+        for y, row in enumerate(tiles):
+            cells[y * width:(y + 1) * width] = bytes(self._palette_index(tile) for tile in row)
+        self._cells = cells
+        self.width = width
+        self.height = height
+        self._shared = False
+
+    def _init_palette(self, first_tile: T):
+        self._palette: list[T] = list(type(first_tile)) if isinstance(first_tile, Enum) else []
+        self._index: dict[T, int] = {tile: index for index, tile in enumerate(self._palette)}
+
+    def _palette_index(self, tile: T) -> int:
+        if (index := self._index.get(tile)) is None:
+            if len(self._palette) == 256:
+                raise ValueError(f"CompactGrid supports at most 256 distinct tiles, cannot add {tile}")
+            index = len(self._palette)
+            self._palette.append(tile)
+            self._index[tile] = index
+        return index
+
+    def copy(self) -> Self:
+        result = self.__class__.__new__(self.__class__)
+        result.__dict__.update(self.__dict__)
+        self._shared = result._shared = True
+        return result
+
+    @classmethod
+    def from_size(cls, width: int, height: int, tile: T) -> Self:
+        return cls.from_lines([" " * width] * height, lambda _: tile)
+
+    @classmethod
+    def from_lines(cls, lines: list[str], converter_function: Callable[[str], T]) -> Self:
+        # Every distinct character only goes through the converter once
+        converted: dict[str, int] = {}
+        result = cls.__new__(cls)
+        result.width, result.height = len(lines[0]), len(lines)
+        result._init_palette(converter_function(lines[0][0]))
+        result._cells = bytearray()
+        for line in lines:
+            for char in line:
+                if (index := converted.get(char)) is None:
+                    index = converted[char] = result._palette_index(converter_function(char))
+                result._cells.append(index)
+        result._shared = False
+        return result
+
+    @property
+    def tiles(self) -> list[list[T]]:
+        """ Snapshot in the layout of Grid.tiles, changing it does not change the grid
+        """
+        palette, width = self._palette, self.width
+        return [[palette[cell] for cell in self._cells[y * width:(y + 1) * width]] for y in range(self.height)]
+
+    @classmethod
+    def from_cells(cls, cells: bytes, width: int, palette: list[T]) -> Self:
+        """ Build from row-major palette indices, the inverse of snapshot() and palette
+        """
+        result = cls.__new__(cls)
+        result.width, result.height = width, len(cells) // width
+        result._palette = list(palette)
+        result._index = {tile: index for index, tile in enumerate(result._palette)}
+        result._cells = bytearray(cells)
+        result._shared = False
+        return result
+
+    @property
+    def palette(self) -> list[T]:
+        """ The tiles the bytes of snapshot() index into
+        """
+        return self._palette
+
+    def snapshot(self) -> bytes:
+        """ Hashable copy of the grid contents, cheap to compare and store
+        """
+        return bytes(self._cells)
+
+    def value_at(self, x: int, y: int) -> T:
+        return self._palette[self._cells[y * self.width + x]]
+
+    def value_at_or(self, x: int, y: int, default: T | None = None) -> T | None:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self._palette[self._cells[y * self.width + x]]
+        else:
+            return default
+
+    def set_value_at(self, x: int, y: int, value: T):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise KeyError(f"Invalid coordinates {x}, {y} for grid with width {self.width} and height {self.height}")
+        if self._shared:
+            self._cells = bytearray(self._cells)
+            self._palette = self._palette.copy()
+            self._index = self._index.copy()
+            self._shared = False
+        self._cells[y * self.width + x] = self._palette_index(value)
+
+    @property
+    def coords_iterator(self) -> Generator[tuple[int, int, T], None, None]:
+        palette, width = self._palette, self.width
+        for position, cell in enumerate(self._cells):
+            y, x = divmod(position, width)
+            yield x, y, palette[cell]
+
+    @property
+    def tiles_iterator(self) -> Generator[T, None, None]:
+        palette = self._palette
+        for cell in self._cells:
+            yield palette[cell]
+
+    def print_grid(self, print_function: Callable[[T], str]):
+        for row in self.tiles:
+            print("".join(print_function(tile) for tile in row))
+
+    def print_grid_using_coords(self, print_function: Callable[[int, int, T], str]):
+        for y, row in enumerate(self.tiles):
+            print("".join(print_function(x, y, tile) for x, tile in enumerate(row)))
+
+    def all_coords_for(self, values: set[T]) -> Generator[tuple[int, int], None, None]:
+        width = self.width
+        indices = {self._index[value] for value in values if value in self._index}
+        if len(indices) == 1:
+            # bytearray.find scans in C, far quicker than checking every cell in Python
+            index = indices.pop()
+            position = self._cells.find(index)
+            while position != -1:
+                yield position % width, position // width
+                position = self._cells.find(index, position + 1)
+        else:
+            for position, cell in enumerate(self._cells):
+                if cell in indices:
+                    yield position % width, position // width
 
 
 Coords = namedtuple("Coords", ["x", "y"])
 
 
 def shortest_path_analysis(grid: Grid[T], start_tile: T, wall_tile: T) -> dict[Coords, int]:
-    visited: dict[Coords, int] = {}
-    for start_coords in grid.all_coords_for({start_tile}):
-        visited[start_coords] = 0
-    boundary: deque[Coords] = deque()
-    boundary.extend(grid.all_coords_for({start_tile}))
-    while boundary:
-        coords = boundary.pop()
-        for direction in Direction.all():
-            new_coords = direction.next_coords(*coords)
-            if grid.value_at_or(*new_coords, default=wall_tile) != wall_tile:
-                old_visit = visited.get(new_coords, sys.maxsize)
-                if old_visit > visited[coords] + 1:
-                    visited[new_coords] = visited[coords] + 1
-                    boundary.append(new_coords)
-    return visited
+    """ Steps from the nearest start tile to every reachable tile
+    """
+    width = grid.width
+    starts = [y * width + x for x, y in grid.all_coords_for({start_tile})]
+    result = bfs(width * grid.height, starts, grid_neighbours(width, grid.height, lambda x, y: grid.value_at(x, y) != wall_tile))
+    return {Coords(state % width, state // width): distance
+            for state, distance in enumerate(result.distances) if distance != UNREACHED}
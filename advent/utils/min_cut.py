@@ -0,0 +1,171 @@
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from heapq import heapify, heappush, heappop
+from multiprocessing.synchronize import Event
+
+from advent.utils.graph import CSRGraph
+from advent.utils.union_find import DisjointSet
+
+# Both modes expect undirected graphs with every edge stored in both directions, as GraphBuilder.add_bidirectional_edge does
+
+
+@dataclass
+class Cut:
+    weight: int
+    # Every cut edge once, as (vertex, vertex) pairs of graph indices with the first vertex on side 0
+    edges: list[tuple[int, int]]
+    sizes: tuple[int, int]
+    # 0 or 1 per vertex
+    sides: bytearray
+
+
+def _cut_from_sides(graph: CSRGraph, sides: bytearray) -> Cut:
+    edges = []
+    weight = 0
+    for vertex in range(graph.vertex_count):
+        if not sides[vertex]:
+            for target, edge_weight in graph.edges(vertex):
+                if sides[target]:
+                    edges.append((vertex, target))
+                    weight += edge_weight
+    second_size = sum(sides)
+    return Cut(weight=weight, edges=edges, sizes=(len(sides) - second_size, second_size), sides=sides)
+
+
+def stoer_wagner(graph: CSRGraph) -> Cut:
+    """ Deterministic global minimum cut. Every phase orders the vertices by maximum adjacency, the last one added is
+        cut off with the total weight connecting it and then merged into the one before it. O(V * E * log V).
+        Meant for graphs up to a couple of thousand vertices: the 1.5k vertices of 2023/25 already take 10 to 30 seconds,
+        random_contraction is the one for anything bigger.
+    """
+    vertex_count = graph.vertex_count
+    if vertex_count < 2:
+        raise ValueError("A cut needs at least two vertices")
+    adjacency: list[dict[int, int]] = [{} for _ in range(vertex_count)]
+    for vertex in range(vertex_count):
+        for target, weight in graph.edges(vertex):
+            if target != vertex:
+                adjacency[vertex][target] = weight
+    members = [[vertex] for vertex in range(vertex_count)]
+    active = set(range(vertex_count))
+    best_weight, best_members = None, []
+    while len(active) > 1:
+        connection = dict.fromkeys(active, 0)
+        added = bytearray(vertex_count)
+        # Disconnected vertices stay at 0 and still get their turn
+        heap = [(0, vertex) for vertex in active]
+        heapify(heap)
+        previous = last = None
+        while heap:
+            negative_connection, vertex = heappop(heap)
+            if added[vertex] or -negative_connection != connection[vertex]:
+                continue
+            added[vertex] = 1
+            previous, last = last, vertex
+            for neighbour, weight in adjacency[vertex].items():
+                if not added[neighbour]:
+                    connection[neighbour] += weight
+                    heappush(heap, (-connection[neighbour], neighbour))
+        if best_weight is None or connection[last] < best_weight:
+            best_weight, best_members = connection[last], list(members[last])
+        for neighbour, weight in adjacency[last].items():
+            del adjacency[neighbour][last]
+            if neighbour != previous:
+                adjacency[previous][neighbour] = adjacency[previous].get(neighbour, 0) + weight
+                adjacency[neighbour][previous] = adjacency[neighbour].get(previous, 0) + weight
+        adjacency[last] = {}
+        if len(members[previous]) < len(members[last]):
+            members[previous], members[last] = members[last], members[previous]
+        members[previous].extend(members[last])
+        active.remove(last)
+    sides = bytearray(vertex_count)
+    for vertex in best_members:
+        sides[vertex] = 1
+    return _cut_from_sides(graph, sides)
+
+
+# Set in pool workers once another batch found a cut of the target weight
+_stop_trials: Event | None = None
+
+
+def _watch_for_stop(stop: Event):
+    global _stop_trials
+    _stop_trials = stop
+
+
+def _contraction_trials(arguments: tuple) -> bytearray:
+    """ Runs Karger contractions until one gives a cut of at most target_weight, returns the sides of the best one
+    """
+    vertex_count, edges, weights, trials, seed, target_weight = arguments
+    generator = random.Random(seed)
+    best_weight, best_sides = None, bytearray(vertex_count)
+    order = list(range(len(edges)))
+    unit_weights = all(weight == 1 for weight in weights)
+    for _ in range(trials):
+        if _stop_trials is not None and _stop_trials.is_set():
+            break
+        if unit_weights:
+            generator.shuffle(order)
+        else:
+            # Sorting on exponential keys with the edge weights as rates draws the edges in proportion to their weight
+            keys = [generator.expovariate(weight) for weight in weights]
+            order.sort(key=keys.__getitem__)
+        sets = DisjointSet(vertex_count)
+        for edge in order:
+            if sets.set_count <= 2:
+                break
+            sets.union(*edges[edge])
+        first = sets.find(0)
+        sides = bytearray(sets.find(vertex) != first for vertex in range(vertex_count))
+        weight = sum(edge_weight for (start, end), edge_weight in zip(edges, weights) if sides[start] != sides[end])
+        if best_weight is None or weight < best_weight:
+            best_weight, best_sides = weight, sides
+            if target_weight is not None and weight <= target_weight:
+                break
+    return best_sides
+
+
+def random_contraction(graph: CSRGraph, trials: int = 1000, jobs: int | None = None, seed: int | None = None,
+                       target_weight: int | None = None) -> Cut:
+    """ Karger's randomized contraction: merging the endpoints of edges in random order until two groups are left
+        gives a minimum cut with some probability, so repeat it trials times and keep the lightest cut.
+        Every trial is a single union-find pass over the edges. With jobs above one the trials are spread over a
+        process pool. Knowing the weight of the cut up front, target_weight stops as soon as such a cut shows up.
+        Edges are contracted with a probability in proportion to their weight, so weights have to be positive.
+    """
+    if graph.vertex_count < 2:
+        raise ValueError("A cut needs at least two vertices")
+    edges, weights = [], []
+    for vertex in range(graph.vertex_count):
+        for target, weight in graph.edges(vertex):
+            if weight <= 0:
+                raise ValueError(f"Random contraction needs positive edge weights, found {weight} from {vertex} to {target}")
+            if vertex < target:
+                edges.append((vertex, target))
+                weights.append(weight)
+    seeds = random.Random(seed)
+    if jobs and jobs > 1:
+        # Small batches so the pool can stop early once a target cut is found: batches not started yet are cancelled,
+        # running ones see the stop event before their next trial
+        batch_count = max(jobs, min(trials, 16 * jobs))
+        batches = [trials // batch_count + (batch < trials % batch_count) for batch in range(batch_count)]
+        arguments = [(graph.vertex_count, edges, weights, batch, seeds.getrandbits(64), target_weight) for batch in batches if batch]
+        best = None
+        stop = multiprocessing.Event()
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_watch_for_stop, initargs=(stop,)) as executor:
+            pending = {executor.submit(_contraction_trials, batch_arguments) for batch_arguments in arguments}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    cut = _cut_from_sides(graph, future.result())
+                    if best is None or cut.weight < best.weight:
+                        best = cut
+                if target_weight is not None and best.weight <= target_weight:
+                    stop.set()
+                    for future in pending:
+                        future.cancel()
+                    break
+        return best
+    return _cut_from_sides(graph, _contraction_trials((graph.vertex_count, edges, weights, trials, seeds.getrandbits(64), target_weight)))
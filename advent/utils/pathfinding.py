@@ -0,0 +1,156 @@
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from heapq import heappush, heappop
+from typing import Callable, Iterable
+
+from advent.utils.enums import Direction
+
+# States are ints in range(state_count), solvers pack their coordinates, direction and such into them.
+# Neighbour functions yield the next states, for weighted searches as (state, cost) pairs.
+UnweightedNeighbours = Callable[[int], Iterable[int]]
+WeightedNeighbours = Callable[[int], Iterable[tuple[int, int]]]
+GoalCheck = Callable[[int], bool]
+
+UNREACHED = -1
+
+
+@dataclass
+class SearchResult:
+    # Flat tables indexed by state, UNREACHED where the search never got
+    distances: array
+    predecessors: array | None
+    # The goal state the search stopped at, None without a goal or when none could be reached
+    goal: int | None = None
+
+    def distance(self, state: int) -> int | None:
+        distance = self.distances[state]
+        return None if distance == UNREACHED else distance
+
+    def path(self, state: int) -> list[int]:
+        """ States from a start to state, only available when predecessors were tracked
+        """
+        if self.predecessors is None:
+            raise ValueError("Predecessors were not tracked in this search")
+        if self.distances[state] == UNREACHED:
+            return []
+        path = [state]
+        while (state := self.predecessors[state]) != UNREACHED:
+            path.append(state)
+        path.reverse()
+        return path
+
+
+def _tables(state_count: int, track_predecessors: bool) -> tuple[array, array | None]:
+    distances = array("q", [UNREACHED]) * state_count
+    predecessors = array("q", [UNREACHED]) * state_count if track_predecessors else None
+    return distances, predecessors
+
+
+def bfs(state_count: int, starts: Iterable[int], neighbours: UnweightedNeighbours,
+        goal: GoalCheck | None = None, track_predecessors: bool = False) -> SearchResult:
+    """ Breadth first search where every step costs 1, level by level
+    """
+    distances, predecessors = _tables(state_count, track_predecessors)
+    frontier = []
+    for start in starts:
+        if distances[start] == UNREACHED:
+            distances[start] = 0
+            frontier.append(start)
+            if goal and goal(start):
+                return SearchResult(distances, predecessors, start)
+    distance = 0
+    while frontier:
+        distance += 1
+        next_frontier = []
+        for state in frontier:
+            for next_state in neighbours(state):
+                if distances[next_state] == UNREACHED:
+                    distances[next_state] = distance
+                    if predecessors is not None:
+                        predecessors[next_state] = state
+                    # The first time a state is seen is along a shortest path
+                    if goal and goal(next_state):
+                        return SearchResult(distances, predecessors, next_state)
+                    next_frontier.append(next_state)
+        frontier = next_frontier
+    return SearchResult(distances, predecessors)
+
+
+def zero_one_bfs(state_count: int, starts: Iterable[int], neighbours: WeightedNeighbours,
+                 goal: GoalCheck | None = None, track_predecessors: bool = False) -> SearchResult:
+    """ Shortest paths when every step costs either 0 or 1, using a deque instead of a heap
+    """
+    distances, predecessors = _tables(state_count, track_predecessors)
+    done = bytearray(state_count)
+    to_visit: deque[int] = deque()
+    for start in starts:
+        distances[start] = 0
+        to_visit.append(start)
+    while to_visit:
+        state = to_visit.popleft()
+        if done[state]:
+            continue
+        done[state] = 1
+        if goal and goal(state):
+            return SearchResult(distances, predecessors, state)
+        distance = distances[state]
+        for next_state, cost in neighbours(state):
+            new_distance = distance + cost
+            old_distance = distances[next_state]
+            if old_distance == UNREACHED or new_distance < old_distance:
+                distances[next_state] = new_distance
+                if predecessors is not None:
+                    predecessors[next_state] = state
+                if cost:
+                    to_visit.append(next_state)
+                else:
+                    to_visit.appendleft(next_state)
+    return SearchResult(distances, predecessors)
+
+
+def dijkstra(state_count: int, starts: Iterable[int], neighbours: WeightedNeighbours,
+             goal: GoalCheck | None = None, track_predecessors: bool = False) -> SearchResult:
+    return a_star(state_count, starts, neighbours, heuristic=None, goal=goal, track_predecessors=track_predecessors)
+
+
+def a_star(state_count: int, starts: Iterable[int], neighbours: WeightedNeighbours, heuristic: Callable[[int], int] | None,
+           goal: GoalCheck | None = None, track_predecessors: bool = False) -> SearchResult:
+    """ Dijkstra ordered by distance plus heuristic, which must never overestimate the remaining cost.
+        Without a heuristic this is plain Dijkstra. Stale heap entries are skipped instead of removed.
+    """
+    distances, predecessors = _tables(state_count, track_predecessors)
+    heap: list[tuple[int, int, int]] = []
+    for start in starts:
+        distances[start] = 0
+        heappush(heap, (heuristic(start) if heuristic else 0, 0, start))
+    while heap:
+        _, distance, state = heappop(heap)
+        if distance != distances[state]:
+            continue
+        if goal and goal(state):
+            return SearchResult(distances, predecessors, state)
+        for next_state, cost in neighbours(state):
+            new_distance = distance + cost
+            old_distance = distances[next_state]
+            if old_distance == UNREACHED or new_distance < old_distance:
+                distances[next_state] = new_distance
+                if predecessors is not None:
+                    predecessors[next_state] = state
+                heappush(heap, (new_distance + heuristic(next_state) if heuristic else new_distance, new_distance, next_state))
+    return SearchResult(distances, predecessors)
+
+
+def grid_neighbours(width: int, height: int, passable: Callable[[int, int], bool],
+                    directions: Iterable[Direction] = Direction.all()) -> UnweightedNeighbours:
+    """ Neighbour function over the cells of a grid, packed as y * width + x
+    """
+    offsets = [direction.next_coords(0, 0) for direction in directions]
+
+    def neighbours(state: int) -> Iterable[int]:
+        y, x = divmod(state, width)
+        for dx, dy in offsets:
+            new_x, new_y = x + dx, y + dy
+            if 0 <= new_x < width and 0 <= new_y < height and passable(new_x, new_y):
+                yield new_y * width + new_x
+    return neighbours
@@ -1,13 +1,55 @@
 from typing import Protocol, Generator
 
+from advent.inputs import PuzzleInput
 
-class SolverFunction(Protocol):
+Answer = int | str
+
+
+class PrintingSolverFunction(Protocol):
+    """ Original protocol, the solver prints its answer and returns None
+    """
     def __call__(self,
                  puzzle_input: list[str],
                  example: bool) -> None:
         pass
 
 
+class AnswerSolverFunction(Protocol):
+    """ The solver returns its answer and leaves printing it to the caller
+    """
+    def __call__(self,
+                 puzzle_input: list[str],
+                 example: bool) -> Answer:
+        pass
+
+
+SolverFunction = PrintingSolverFunction | AnswerSolverFunction
+
+# Worker processes a solver may start for its own parallel work, None keeps every solver sequential
+_solver_jobs: int | None = None
+
+
+def set_solver_jobs(jobs: int | None):
+    global _solver_jobs
+    _solver_jobs = jobs if jobs and jobs > 1 else None
+
+
+def solver_jobs(example: bool = False) -> int | None:
+    """ Job count for solvers that can spread their work over processes, None to stay sequential.
+        Only solve --jobs turns it on, examples are always too small to be worth a process pool.
+    """
+    return None if example else _solver_jobs
+
+
+def call_solver(solver: SolverFunction, puzzle_input: PuzzleInput, example: bool) -> Answer | None:
+    """ Call either kind of solver, returns None for solvers still printing their answer
+    """
+    answer = solver(puzzle_input=puzzle_input, example=example)
+    if answer is not None and not isinstance(answer, (int, str)):
+        raise TypeError(f"Solver {solver.__module__}.{solver.__name__} returned unsupported answer {answer!r}")
+    return answer
+
+
 def split_in_groups_separated_by_empty_line(puzzle_input: list[str]) -> Generator[list[str], None, None]:
     lines = []
     for line in puzzle_input:
@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+from functools import wraps
+from time import perf_counter
+from typing import Callable
+
+# None while disabled, so a disabled span costs one global lookup and no clock reads
+_timings: dict[str, "SpanTiming"] | None = None
+_stack: list[str] = []
+
+
+@dataclass
+class SpanTiming:
+    name: str
+    count: int = 0
+    seconds: float = 0.0
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        # Nested spans are reported under their parents, as parent/child
+        self.name = f"{_stack[-1]}/{name}" if _stack else name
+
+    def __enter__(self):
+        if _timings is not None and self.name not in _timings:
+            _timings[self.name] = SpanTiming(self.name)
+        _stack.append(self.name)
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = perf_counter() - self.start
+        _stack.pop()
+        if _timings is not None and (timing := _timings.get(self.name)):
+            timing.count += 1
+            timing.seconds += seconds
+        return False
+
+
+def span(name: str) -> _Span | _NoSpan:
+    """ Time a phase of a solver: with span("parse"): ...
+        Does nothing unless spans were enabled, for instance with solve --spans.
+    """
+    if _timings is None:
+        return _NO_SPAN
+    return _Span(name)
+
+
+def timed(name: str | None = None) -> Callable[[Callable], Callable]:
+    """ Decorator timing every call of a function as a span, named after the function by default
+    """
+    def decorator(function: Callable) -> Callable:
+        span_name = name or function.__name__
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if _timings is None:
+                return function(*args, **kwargs)
+            with _Span(span_name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def enable_spans():
+    global _timings
+    _timings = {}
+    _stack.clear()
+
+
+def disable_spans() -> list[SpanTiming]:
+    """ Stop recording, returns the timings in the order the spans were first entered
+    """
+    global _timings
+    timings, _timings = _timings, None
+    return list(timings.values()) if timings else []
+
+
+def print_span_timings(timings: list[SpanTiming]):
+    if not timings:
+        print("No spans were recorded")
+        return
+    print(f"{'span':<40} {'calls':>8} {'total':>10} {'per call':>10}")
+    for timing in timings:
+        print(f"{timing.name:<40} {timing.count:>8} {timing.seconds:>9.4f}s {timing.seconds / timing.count:>9.6f}s")
@@ -0,0 +1,36 @@
+from array import array
+
+
+class DisjointSet:
+    """ Union-find over the ints in range(size), with union by size and path halving
+    """
+    def __init__(self, size: int):
+        self.parents = array("q", range(size))
+        self.sizes = array("q", [1]) * size
+        self.set_count = size
+
+    def find(self, element: int) -> int:
+        parents = self.parents
+        while (parent := parents[element]) != element:
+            parents[element] = grandparent = parents[parent]
+            element = grandparent
+        return element
+
+    def union(self, first: int, second: int) -> bool:
+        """ Merges the sets holding both elements, returns False when they already were in the same set
+        """
+        first, second = self.find(first), self.find(second)
+        if first == second:
+            return False
+        if self.sizes[first] < self.sizes[second]:
+            first, second = second, first
+        self.parents[second] = first
+        self.sizes[first] += self.sizes[second]
+        self.set_count -= 1
+        return True
+
+    def connected(self, first: int, second: int) -> bool:
+        return self.find(first) == self.find(second)
+
+    def set_size(self, element: int) -> int:
+        return self.sizes[self.find(element)]
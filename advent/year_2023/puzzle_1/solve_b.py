@@ -1,6 +1,7 @@
 import re
-from typing import Generator
+from typing import Generator, Iterator
 
+from advent.inputs import InputForm
 from advent.registry import register_solver
 
 PATTERN = re.compile(r"\d|(one)|(two)|(three)|(four)|(five)|(six)|(seven)|(eight)|(nine)")
@@ -39,13 +40,10 @@ def line_to_digits(line: str) -> Generator[str, None, None]:
 
 def parse_line(line: str) -> int:
     digits = list(line_to_digits(line))
-    print(f"{line=}, {digits=}")
     result = int(f"{str_to_number(digits[0])}{str_to_number(digits[-1])}")
-    print(f"{result=}")
     return result
 
 
-@register_solver(year="2023", key="1", variation="b")
-def solve(puzzle_input: list[str], example: bool) -> None:
-    solution = sum(map(parse_line, puzzle_input))
-    print(f"Solution is {solution}")
+@register_solver(year="2023", key="1", variation="b", input_form=InputForm.LINE_ITERATOR)
+def solve(puzzle_input: Iterator[str], example: bool) -> int:
+    return sum(map(parse_line, puzzle_input))
@@ -1,7 +1,9 @@
 from collections import Counter
-from functools import cache, cached_property
+from functools import cache, cached_property, reduce
+from operator import or_
 from typing import Self, Generator
 
+from advent.utils.array_grid import ArrayGrid, numpy_available, shifted, flood_fill, border_mask
 from advent.utils.enums import PrintEnum, Direction
 
 DEBUG = False
@@ -70,6 +72,30 @@ class Board:
         raise ValueError("Lose the starting square, shouldn't happen!!")
 
     def cleanup(self):
+        if numpy_available():
+            self._cleanup_array()
+        else:
+            self._cleanup_loops()
+
+    def _cleanup_array(self):
+        """ Every round clears, all at once, each pipe with an end its neighbour does not connect back to
+        """
+        grid = ArrayGrid.from_tiles(self.tiles)
+        start = grid.mask(PipeStatus.START)
+        total_changed = 0
+        while True:
+            goes = {direction: grid.lookup(lambda tile: tile.can_go(direction)) for direction in Direction.all()}
+            broken = reduce(or_, (goes[direction] & ~shifted(goes[direction.opposite], direction, fill=False) for direction in Direction.all()))
+            broken &= ~start
+            changed = int(broken.sum())
+            if not changed:
+                break
+            grid.fill(broken, PipeStatus.EMPTY)
+            total_changed += changed
+            print(f"Cleanup round has cleaned {changed} tiles. Total_changed: {total_changed} of {self.width * self.height}")
+        self.tiles = grid.tiles
+
+    def _cleanup_loops(self):
         max_change = self.width * self.height
         total_changed = 0
         changed = 1
@@ -128,6 +154,22 @@ class Board:
         return Counter(self.list_all_real_categorization_elements())
 
     def categorize_board(self):
+        if numpy_available():
+            self._categorize_board_array()
+        else:
+            self._categorize_board_loops()
+
+    def _categorize_board_array(self):
+        """ Everything unknown that is connected to the edge of the board is outside
+        """
+        grid = ArrayGrid.from_tiles(self.categorization)
+        unknown = grid.mask(InsideOutsideStatus.UNKNOWN)
+        outside = flood_fill(unknown, seeds=border_mask(unknown.shape))
+        grid.fill(outside, InsideOutsideStatus.OUTSIDE)
+        print(f"Categorizing has changed {int(outside.sum())} elements")
+        self.categorization = grid.tiles
+
+    def _categorize_board_loops(self):
         total_changed = 0
         changed = 1
         while changed > 0:
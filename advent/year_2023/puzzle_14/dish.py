@@ -2,6 +2,7 @@ from enum import Enum
 from itertools import starmap
 from typing import Generator, Self
 
+from advent.utils.array_grid import ArrayGrid, numpy_available, np
 from advent.utils.enums import Direction
 
 
@@ -51,6 +52,20 @@ class Dish:
         self._roll(Direction.NORTH)
 
     def _roll(self, direction: Direction):
+        self._roll_all([direction])
+
+    def _roll_all(self, directions: list[Direction]):
+        if numpy_available():
+            # Convert once for all directions, the rolls themselves are cheap
+            grid = ArrayGrid.from_tiles(self.rocks)
+            for direction in directions:
+                _roll_array(grid, direction)
+            self.rocks = grid.tiles
+        else:
+            for direction in directions:
+                self._roll_loops(direction)
+
+    def _roll_loops(self, direction: Direction):
         changed = True
         while changed:
             changed = False
@@ -65,10 +80,7 @@ class Dish:
                             changed = True
 
     def spin_cycle(self):
-        self._roll(Direction.NORTH)
-        self._roll(Direction.WEST)
-        self._roll(Direction.SOUTH)
-        self._roll(Direction.EAST)
+        self._roll_all([Direction.NORTH, Direction.WEST, Direction.SOUTH, Direction.EAST])
 
     def generate_rock_with_coordinates(self) -> Generator[tuple[RockStatus, int, int], None, None]:
         for y in range(0, self.height):
@@ -98,3 +110,31 @@ class Dish:
     @staticmethod
     def from_lines(lines: list[str]) -> Self:
         return Dish(rocks=[[RockStatus.from_char(char) for char in line] for line in lines])
+
+
+def _roll_array(grid: ArrayGrid[RockStatus], direction: Direction):
+    """ Roll all round rocks at once. The view is oriented so rocks roll towards row 0, after which every
+        stretch of a column between cube rocks holds its round rocks at the start of the stretch.
+    """
+    match direction:
+        case Direction.NORTH:
+            view = grid.cells
+        case Direction.SOUTH:
+            view = grid.cells[::-1, :]
+        case Direction.WEST:
+            view = grid.cells.T
+        case Direction.EAST:
+            view = grid.cells.T[::-1, :]
+        case _:
+            raise ValueError(f"Impossible, unsupported direction: {direction}")
+    height, width = view.shape
+    cube = view == grid.index_of(RockStatus.CUBE)
+    round_rock = view == grid.index_of(RockStatus.ROUND)
+    rows = np.arange(height)[:, None]
+    # Row of the last cube at or above every cell, -1 when there is none
+    last_cube = np.maximum.accumulate(np.where(cube, rows, -1), axis=0)
+    stretch = (last_cube + 1) * width + np.arange(width)[None, :]
+    round_count = np.bincount(stretch[round_rock], minlength=(height + 1) * width)
+    rolled = ~cube & (rows - last_cube - 1 < round_count[stretch])
+    view[~cube] = grid.index_of(RockStatus.EMPTY)
+    view[rolled] = grid.index_of(RockStatus.ROUND)
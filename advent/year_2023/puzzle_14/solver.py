@@ -1,5 +1,6 @@
-from advent.year_2023.puzzle_14.dish import Dish, RockStatus
+from advent.year_2023.puzzle_14.dish import Dish
 from advent.registry import register_solver
+from advent.utils.cycles import fast_forward
 
 
 @register_solver(year="2023", key="14", variation="a")
@@ -13,22 +14,8 @@ def solve_a(puzzle_input: list[str], example: bool) -> None:
 
 
 def run_cycles(dish: Dish, cycles: int) -> int:
-    snapshots_to_cycle: dict[tuple[tuple[RockStatus]], int] = {dish.snapshot(): 0}
-    load_by_cycle: dict[int, int] = {0: dish.total_load_north()}
-    for cycle in range(1, cycles + 1):
-        dish.spin_cycle()
-        snapshot = dish.snapshot()
-        # We can short-circuit
-        if snapshot in snapshots_to_cycle:
-            previous_cycle = snapshots_to_cycle[snapshot]
-            cycles_to_go = cycles - cycle
-            cycle_offset = cycles_to_go % (cycle - previous_cycle)
-            end_cycle = previous_cycle + cycle_offset
-            return load_by_cycle[end_cycle]
-        snapshots_to_cycle[dish.snapshot()] = cycle
-        load_by_cycle[cycle] = dish.total_load_north()
-        if cycle % 10000 == 0:
-            print(f"Just processed cycle {cycle} of {cycles}")
+    # The dish soon settles into a loop, spin_cycle changes the dish in place
+    dish = fast_forward(dish, Dish.spin_cycle, cycles, fingerprint=Dish.snapshot)
     return dish.total_load_north()
 
 
@@ -1,7 +1,12 @@
 import re
+from mmap import mmap
+from typing import Generator
 
+from advent.inputs import InputForm
 from advent.registry import register_solver
 
+STEP_PATTERN = re.compile(rb"[^,\s]+")
+
 
 def my_hash(string: str) -> int:
     result = 0
@@ -12,10 +17,14 @@ def my_hash(string: str) -> int:
     return result
 
 
-@register_solver(year="2023", key="15", variation="a")
-def solve_a(puzzle_input: list[str], example: bool) -> None:
-    print(puzzle_input)
-    print(sum(my_hash(string) for string in puzzle_input[0].split(",")))
+def generate_steps(puzzle_input: mmap | bytes) -> Generator[str, None, None]:
+    for match in STEP_PATTERN.finditer(puzzle_input):
+        yield match[0].decode()
+
+
+@register_solver(year="2023", key="15", variation="a", input_form=InputForm.MMAP)
+def solve_a(puzzle_input: mmap | bytes, example: bool) -> int:
+    return sum(my_hash(string) for string in generate_steps(puzzle_input))
 
 
 class LensBox:
@@ -37,15 +46,14 @@ class LensBox:
         return result
 
 
-@register_solver(year="2023", key="15", variation="b")
-def solve_b(puzzle_input: list[str], example: bool) -> None:
+@register_solver(year="2023", key="15", variation="b", input_form=InputForm.MMAP)
+def solve_b(puzzle_input: mmap | bytes, example: bool) -> int:
     REMOVE_PATTERN = re.compile(r"([a-z]+)-")
     ADD_PATTERN = re.compile(r"([a-z]+)=(\d)")
-    print(puzzle_input)
     lens_boxes: dict[int, LensBox] = {}
     for i in range(1, 257):
         lens_boxes[i - 1] = LensBox(i)
-    for instruction in puzzle_input[0].split(","):
+    for instruction in generate_steps(puzzle_input):
         if match := REMOVE_PATTERN.fullmatch(instruction):
             lens_label = match[1]
             lens_boxes[my_hash(lens_label)].remove_lens(lens_label)
@@ -53,4 +61,4 @@ def solve_b(puzzle_input: list[str], example: bool) -> None:
             lens_label = match[1]
             lens_strength = int(match[2])
             lens_boxes[my_hash(lens_label)].add_lens(lens_label, lens_strength)
-    print(sum(lens_box.total_lens_power() for lens_box in lens_boxes.values()))
+    return sum(lens_box.total_lens_power() for lens_box in lens_boxes.values())
@@ -2,6 +2,7 @@ from collections import deque, defaultdict
 from dataclasses import dataclass
 
 from advent.utils.enums import PrintEnum, Direction
+from advent.utils.graph import strongly_connected_components
 from advent.utils.grid import Grid
 
 DEBUG = False
@@ -91,3 +92,67 @@ def generate_beams_by_coords(grid: Grid, initial_beam: Beam) -> dict[tuple[int,
                     if DEBUG:
                         print(f"Beam from {beam.entry} at {beam.x}, {beam.y}, causes new beam from {new_beam.entry} at {new_beam.x}, {new_beam.y}")
     return result
+
+
+class BeamGraph:
+    """ The beams compiled into a graph: a node is a beam entering a mirror or splitter, an edge the straight stretch
+        of cells a beam crosses to the next one. Beams looping around form strongly connected components, collapsed into
+        one bitset of the cells they energize, which includes everything reachable from them.
+    """
+    def __init__(self, grid: Grid):
+        self.grid = grid
+        self.nodes: dict[tuple[int, int, Direction], int] = {}
+        for x, y, tile in grid.coords_iterator:
+            if not tile.empty():
+                for entry in Direction.all():
+                    self.nodes[(x, y, entry)] = len(self.nodes)
+        # Per node the stretches leaving it, as cells bitset and the node the stretch ends at, None off the grid
+        self.stretches: list[list[tuple[int, int | None]]] = [[] for _ in self.nodes]
+        for (x, y, entry), node in self.nodes.items():
+            for exit_direction in grid.value_at(x, y).beam_to(entry):
+                new_x, new_y = exit_direction.next_coords(x, y)
+                if grid.within_bounds(new_x, new_y):
+                    self.stretches[node].append(self.walk(Beam(new_x, new_y, exit_direction.opposite)))
+        self.component_cells = self._energize_components()
+
+    def cell_bit(self, x: int, y: int) -> int:
+        return 1 << (y * self.grid.width + x)
+
+    def walk(self, beam: Beam) -> tuple[int, int | None]:
+        """ Cells from the beam up to and including the first mirror or splitter, which is the node returned
+        """
+        x, y = beam.x, beam.y
+        travel = beam.entry.opposite
+        cells = 0
+        while self.grid.within_bounds(x, y):
+            cells |= self.cell_bit(x, y)
+            if not self.grid.value_at(x, y).empty():
+                return cells, self.nodes[(x, y, beam.entry)]
+            x, y = travel.next_coords(x, y)
+        return cells, None
+
+    def _energize_components(self) -> list[int]:
+        successors = [[target for _, target in stretches if target is not None] for stretches in self.stretches]
+        components = strongly_connected_components(successors)
+        self.component_of = [0] * len(self.nodes)
+        component_cells = []
+        # Reverse topological order, so every component it reaches already has its cells
+        for component_index, component in enumerate(components):
+            for node in component:
+                self.component_of[node] = component_index
+            cells = 0
+            for node in component:
+                for stretch_cells, target in self.stretches[node]:
+                    cells |= stretch_cells
+                    if target is not None and self.component_of[target] != component_index:
+                        cells |= component_cells[self.component_of[target]]
+            component_cells.append(cells)
+        return component_cells
+
+    def energized(self, beam: Beam) -> int:
+        """ Number of cells energized by a beam entering the grid
+        """
+        cells, node = self.walk(beam)
+        if node is not None:
+            cells |= self.component_cells[self.component_of[node]]
+        return cells.bit_count()
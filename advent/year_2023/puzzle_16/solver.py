@@ -1,9 +1,11 @@
+from concurrent.futures import ProcessPoolExecutor
 from typing import Generator
 
-from advent.year_2023.puzzle_16.mirrors_and_splitters import TileStatus, generate_beams_by_coords, Beam
+from advent.year_2023.puzzle_16.mirrors_and_splitters import TileStatus, generate_beams_by_coords, Beam, BeamGraph
 from advent.registry import register_solver
 from advent.utils.enums import Direction
 from advent.utils.grid import Grid
+from advent.utils.solver import solver_jobs
 
 GridWithTileStatus = Grid[TileStatus]
 
@@ -33,19 +35,28 @@ def solve_a(puzzle_input: list[str], example: bool) -> None:
     print(len(beams_by_coords.keys()))
 
 
-def calculate_energization_for_all_options(grid: Grid) -> Generator[int, None, None]:
+def _energize_options(arguments: tuple[BeamGraph, list[Beam]]) -> list[int]:
+    beam_graph, options = arguments
+    return [beam_graph.energized(option) for option in options]
+
+
+def calculate_energization_for_all_options(grid: Grid, jobs: int | None = None) -> Generator[int, None, None]:
     options: list[Beam] = []
     options.extend(Beam(x, 0, Direction.NORTH) for x in range(0, grid.width))
     options.extend(Beam(0, y, Direction.WEST) for y in range(0, grid.height))
     options.extend(Beam(x, grid.height - 1, Direction.SOUTH) for x in range(0, grid.width))
     options.extend(Beam(grid.width - 1, y, Direction.EAST) for y in range(0, grid.height))
-    for option in options:
-        beams_by_coords = generate_beams_by_coords(grid, option)
-        yield len(beams_by_coords.keys())
+    beam_graph = BeamGraph(grid)
+    if jobs and jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for energizations in executor.map(_energize_options, [(beam_graph, options[start::jobs]) for start in range(jobs)]):
+                yield from energizations
+    else:
+        yield from _energize_options((beam_graph, options))
 
 
 @register_solver(year="2023", key="16", variation="b")
 def solve_b(puzzle_input: list[str], example: bool) -> None:
     print(puzzle_input)
     grid = Grid.from_lines(puzzle_input, TileStatus.from_char)
-    print(max(calculate_energization_for_all_options(grid)))
+    print(max(calculate_energization_for_all_options(grid, jobs=solver_jobs(example))))
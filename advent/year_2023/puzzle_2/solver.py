@@ -5,16 +5,12 @@ SACK_CONTENTS_A = {"red": 12, "green": 13, "blue": 14}
 
 
 @register_solver(year="2023", key="2", variation="a")
-def solve_a(puzzle_input: list[str], example: bool) -> None:
-    print(puzzle_input)
+def solve_a(puzzle_input: list[str], example: bool) -> int:
     games = [Game.from_string(puzzle) for puzzle in puzzle_input]
-    solution = sum(map(lambda g: g.id, filter(lambda g: g.possible(SACK_CONTENTS_A), games)))
-    print(f"{solution=}")
+    return sum(map(lambda g: g.id, filter(lambda g: g.possible(SACK_CONTENTS_A), games)))
 
 
 @register_solver(year="2023", key="2", variation="b")
-def solve_b(puzzle_input: list[str], example: bool) -> None:
-    print(puzzle_input)
+def solve_b(puzzle_input: list[str], example: bool) -> int:
     games = [Game.from_string(puzzle) for puzzle in puzzle_input]
-    solution = sum(map(lambda g: g.power_value(), games))
-    print(f"{solution=}")
+    return sum(map(lambda g: g.power_value(), games))
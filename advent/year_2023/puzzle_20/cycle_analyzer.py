@@ -1,10 +1,11 @@
 import math
 from collections.abc import Generator
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from functools import cached_property
 from itertools import combinations
 
-from advent.year_2023.puzzle_20.modules import Module, ConjunctionModule, send_pulse, Pulse, WatcherModule
+from advent.year_2023.puzzle_20.modules import Module, ConjunctionModule, CompiledNetwork
 from advent.utils.range import Range
 
 
@@ -42,8 +43,8 @@ class ModuleArea:
 
 def analyze(modules_by_name: dict[str, Module],
             start_module: str,
-            target_module: str):
-    cycles: list[Cycle] = []
+            target_module: str,
+            jobs: int | None = None):
     final_modules = list(module for module in modules_by_name.values() if target_module in module.destination_strings)
     if len(final_modules) != 1:
         raise ValueError("This analysis method can only work if there's one module leading to the target")
@@ -58,8 +59,14 @@ def analyze(modules_by_name: dict[str, Module],
     if any(not area_1.module_names.isdisjoint(area_2.module_names) for area_1, area_2 in combinations(module_areas, 2)):
         raise ValueError("Failure at splitting the given modules in areas, the areas are not distinct")
 
-    for module_area in module_areas:
-        cycles.append(calculate_cycle(module_area))
+    # The areas share no modules, so their compiled networks can run side by side
+    networks = [compile_area(module_area) for module_area in module_areas]
+    end_identifiers = [module_area.end_module.identifier for module_area in module_areas]
+    if jobs and jobs > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(networks))) as executor:
+            cycles = list(executor.map(calculate_cycle, networks, end_identifiers))
+    else:
+        cycles = [calculate_cycle(network, end_identifier) for network, end_identifier in zip(networks, end_identifiers)]
     print(f"{cycles}")
 
     if any(len(cycle.high_signals) != 1 for cycle in cycles):
@@ -106,28 +113,28 @@ def split_modules(
         )
 
 
-def calculate_cycle(module_area: ModuleArea) -> Cycle:
-    watcher = WatcherModule(identifier="watcher", destination_strings=[])
-    module_area.end_module.destinations.append(watcher)
-    cycle = 1
-    send_pulse(
-        Pulse(
-            high_pulse=False,
-            cycle=cycle,
-            source="button",
-            destination=module_area.start_module
-        )
-    )
-    while any(module.status for module in module_area.modules):
-        send_pulse(
-            Pulse(
-                high_pulse=False,
-                cycle=cycle,
-                source="button",
-                destination=module_area.start_module
-            )
-        )
+def compile_area(module_area: ModuleArea) -> CompiledNetwork:
+    # Feedback loops can lead back to the start module, so it may be among the other modules too
+    modules = {module.identifier: module for module in module_area.modules}
+    return CompiledNetwork(list(modules.values()), entry=module_area.start_module.identifier)
+
+
+def calculate_cycle(network: CompiledNetwork, end_identifier: str) -> Cycle:
+    """ Press until every flip-flop of the area is off again, noting the presses the end module sends high pulses in
+    """
+    end = network.index(end_identifier)
+    high_signals: list[Range] = []
+    high_since: int | None = None
+    cycle = 0
+    while True:
+        watched_pulses: list[bool] = []
+        network.press(watched=end, watched_pulses=watched_pulses)
+        for high_pulse in watched_pulses:
+            if high_pulse and high_since is None:
+                high_since = cycle
+            elif not high_pulse and high_since is not None:
+                high_signals.append(Range(high_since, cycle + 1))
+                high_since = None
         cycle += 1
-    return Cycle(size=cycle,
-                 high_signals=watcher.high_signal_ranges,
-                 )
+        if not network.flip_flops:
+            return Cycle(size=cycle, high_signals=high_signals)
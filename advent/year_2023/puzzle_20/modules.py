@@ -1,20 +1,5 @@
 import re
-from collections import deque
-from dataclasses import dataclass
-from typing import Self, Generator
-
-from advent.utils.range import Range
-
-
-@dataclass
-class Pulse:
-    high_pulse: bool
-    cycle: int
-    source: str
-    destination: "Module"
-
-    def process(self) -> Generator[Self, None, None]:
-        yield from self.destination.receive_pulse(self.high_pulse, self.cycle, self.source)
+from array import array
 
 
 class Module:
@@ -25,84 +10,21 @@ class Module:
         self.destination_strings = destination_strings
         self.destinations: list[Module] = []
 
-    @property
-    def status(self) -> bool:
-        return False
-
-    def register_receiver(self, module: Self):
-        pass
-
-    def send_pulse(self, cycle: int, high_pulse: bool) -> Generator[Pulse, None, None]:
-        for dest in self.destinations:
-            yield Pulse(high_pulse, cycle, self.identifier, dest)
-
-    def receive_pulse(self, high_pulse: bool, cycle: int, source_identifier: str) -> Generator[Pulse, None, None]:
-        yield from self.send_pulse(cycle, high_pulse)
-
     def __repr__(self) -> str:
         return f"{self._PRINT_CHAR}{self.identifier}"
 
 
 class OutputModule(Module):
-    def send_pulse(self, cycle: int, high_pulse: bool) -> Generator[Pulse, None, None]:
-        yield from ()
-
-
-class WatcherModule(Module):
-    _PRINT_CHAR = "@"
-
-    def __init__(self, identifier: str, destination_strings: list[str]):
-        super().__init__(identifier, destination_strings)
-        self.high_signal_ranges = []
-        self.latest_high_signal: int | None = None
-
-    def receive_pulse(self, high_pulse: bool, cycle: int, source_identifier: str) -> Generator[Pulse, None, None]:
-        if not high_pulse:
-            if self.latest_high_signal:
-                self.high_signal_ranges.append(Range(self.latest_high_signal, cycle + 1))
-                self.latest_high_signal = None
-        else:
-            if not self.latest_high_signal:
-                self.latest_high_signal = cycle
-        yield from ()
-
-    def reset(self):
-        self.high_signal_ranges = []
+    pass
 
 
 class FlipFlopModule(Module):
     _PRINT_CHAR = "%"
 
-    def __init__(self, identifier: str, destination_strings: list[str]):
-        super().__init__(identifier, destination_strings)
-        self.on = False
-
-    @property
-    def status(self) -> bool:
-        return self.on
-
-    def receive_pulse(self, high_pulse: bool, cycle: int, source_identifier: str) -> Generator[Pulse, None, None]:
-        if high_pulse:
-            pass
-        else:
-            self.on = not self.on
-            yield from self.send_pulse(cycle, self.on)
-
 
 class ConjunctionModule(Module):
     _PRINT_CHAR = "&"
 
-    def __init__(self, identifier: str, destination_strings: list[str]):
-        super().__init__(identifier, destination_strings)
-        self.last_pulses: dict[str, bool] = {}
-
-    def register_receiver(self, module: Self):
-        self.last_pulses[module.identifier] = False
-
-    def receive_pulse(self, high_pulse: bool, cycle: int, source_identifier: str) -> Generator[Pulse, None, None]:
-        self.last_pulses[source_identifier] = high_pulse
-        yield from self.send_pulse(cycle, not all(self.last_pulses.values()))
-
 
 def parse_module(module_line: str) -> Module:
     MODULE_PATTERN = re.compile(r"([%&])?([a-z]+) -> (.*)")
@@ -121,18 +43,100 @@ def parse_module(module_line: str) -> Module:
                 raise ValueError(f"Invalid module type from {module_line}, namely {type_string}")
 
 
-def send_pulse(initial_pulse: Pulse, debug: bool = False) -> tuple[int, int]:
-    high_pulse_count = 0
-    low_pulse_count = 0
-    pulses: deque[Pulse] = deque()
-    pulses.append(initial_pulse)
-    while pulses:
-        pulse = pulses.popleft()
-        if pulse.high_pulse:
-            high_pulse_count += 1
-        else:
-            low_pulse_count += 1
-        if debug:
-            print(f"Sending pulse from {pulse.source}, high? {pulse.high_pulse} to {pulse.destination.identifier}")
-        pulses.extend(pulse.process())
-    return high_pulse_count, low_pulse_count
+# Kinds of module in a CompiledNetwork
+RELAY = 0
+FLIP_FLOP = 1
+CONJUNCTION = 2
+OUTPUT = 3
+
+
+def _kind(module: Module) -> int:
+    match module:
+        case FlipFlopModule():
+            return FLIP_FLOP
+        case ConjunctionModule():
+            return CONJUNCTION
+        case OutputModule():
+            return OUTPUT
+        case _:
+            return RELAY
+
+
+class CompiledNetwork:
+    """ The modules as integer-indexed arrays. Pulses travel along numbered edges, edge 0 runs from the button to the
+        entry module. Flip-flop states are one bitmask over the modules, the last pulse every conjunction input got is one
+        bitmask over the edges, and every conjunction counts its high inputs so it never has to look at all of them.
+        Only destinations among the given modules get an edge, which makes compiling part of a network possible.
+    """
+    def __init__(self, modules: list[Module], entry: str):
+        self.identifiers = [module.identifier for module in modules]
+        indices = {identifier: index for index, identifier in enumerate(self.identifiers)}
+        self.kinds = array("b", (_kind(module) for module in modules))
+        self.edge_targets = array("l", [indices[entry]])
+        self.outgoing: list[tuple[int, ...]] = []
+        self.input_counts = array("l", [0]) * len(modules)
+        for module in modules:
+            edges = []
+            for destination in module.destinations:
+                if (target := indices.get(destination.identifier)) is not None:
+                    edges.append(len(self.edge_targets))
+                    self.edge_targets.append(target)
+                    self.input_counts[target] += 1
+            self.outgoing.append(tuple(edges))
+        self.queue = array("q", [0]) * (2 * len(self.edge_targets))
+        self.reset()
+
+    def reset(self):
+        self.flip_flops = 0
+        self.high_edges = 0
+        self.high_inputs = array("l", [0]) * len(self.identifiers)
+
+    def index(self, identifier: str) -> int:
+        return self.identifiers.index(identifier)
+
+    def press(self, watched: int = -1, watched_pulses: list[bool] | None = None) -> tuple[int, int]:
+        """ Push the button once, returns the number of high and low pulses sent. The pulses the watched module
+            sends are appended to watched_pulses, True for high.
+        """
+        kinds, edge_targets, outgoing, input_counts = self.kinds, self.edge_targets, self.outgoing, self.input_counts
+        high_inputs = self.high_inputs
+        flip_flops, high_edges = self.flip_flops, self.high_edges
+        queue = self.queue
+        # Pulses are packed as edge * 2 + high
+        queue[0] = 0
+        head, tail = 0, 1
+        high_count, low_count = 0, 1
+        while head < tail:
+            pulse = queue[head]
+            head += 1
+            edge, high = pulse >> 1, pulse & 1
+            target = edge_targets[edge]
+            kind = kinds[target]
+            if kind == FLIP_FLOP:
+                if high:
+                    continue
+                flip_flops ^= 1 << target
+                send_high = flip_flops >> target & 1
+            elif kind == CONJUNCTION:
+                if (high_edges >> edge & 1) != high:
+                    high_edges ^= 1 << edge
+                    high_inputs[target] += 1 if high else -1
+                send_high = 0 if high_inputs[target] == input_counts[target] else 1
+            elif kind == RELAY:
+                send_high = high
+            else:
+                continue
+            if target == watched and watched_pulses is not None:
+                watched_pulses.append(bool(send_high))
+            edges = outgoing[target]
+            if send_high:
+                high_count += len(edges)
+            else:
+                low_count += len(edges)
+            if tail + len(edges) > len(queue):
+                queue.extend(array("q", [0]) * len(queue))
+            for next_edge in edges:
+                queue[tail] = next_edge << 1 | send_high
+                tail += 1
+        self.flip_flops, self.high_edges = flip_flops, high_edges
+        return high_count, low_count
@@ -1,6 +1,7 @@
 from advent.year_2023.puzzle_20.cycle_analyzer import analyze
-from advent.year_2023.puzzle_20.modules import Module, parse_module, OutputModule, Pulse, WatcherModule, send_pulse
+from advent.year_2023.puzzle_20.modules import Module, parse_module, OutputModule, CompiledNetwork
 from advent.registry import register_solver
+from advent.utils.solver import solver_jobs
 
 DEBUG = False
 
@@ -19,8 +20,6 @@ def parse(puzzle_input: list[str]) -> dict[str, Module]:
     # Link all destinations
     for module in modules_by_name.values():
         module.destinations = [modules_by_name[dest] for dest in module.destination_strings if dest in modules_by_name]
-        for dest in module.destinations:
-            dest.register_receiver(module)
     return modules_by_name
 
 
@@ -34,13 +33,14 @@ def sum_low_high_pulse(pulse_tuples: list[tuple[int, int]]) -> tuple[int, int]:
 
 
 def count_pulses(max_cycle: int, modules_by_name: dict[str, Module]) -> tuple[int, int]:
+    network = CompiledNetwork(list(modules_by_name.values()), entry="broadcaster")
     cycle_to_pulses: dict[int, tuple[int, int]] = {}
     for cycle in range(0, max_cycle):
         if DEBUG:
             print(f"Starting a cycle by pressing the button")
         elif cycle % 100000 == 0:
             print(f"Starting cycle {cycle:,}")
-        high_pulse_count, low_pulse_count = send_pulse(Pulse(high_pulse=False, cycle=cycle, source="button", destination=modules_by_name["broadcaster"]))
+        high_pulse_count, low_pulse_count = network.press()
         if DEBUG:
             print(f"{high_pulse_count}, {low_pulse_count} after cycle {cycle}")
         cycle_to_pulses[cycle] = high_pulse_count, low_pulse_count
@@ -60,11 +60,12 @@ def solve_b(puzzle_input: list[str], example: bool) -> None:
     print(puzzle_input)
     modules_by_name = parse(puzzle_input)
     target_module = "rx"
-    modules_by_name[target_module] = WatcherModule(identifier=target_module, destination_strings=[])
+    modules_by_name[target_module] = OutputModule(identifier=target_module, destination_strings=[])
     if example:
         raise ValueError("This solution is tailored to the real input")
     analyze(
         modules_by_name=modules_by_name,
         start_module="broadcaster",
         target_module=target_module,
+        jobs=solver_jobs(example),
     )
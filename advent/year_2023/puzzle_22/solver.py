@@ -1,16 +1,12 @@
 import re
 
-from collections import namedtuple, defaultdict
-from dataclasses import dataclass, field
-from functools import cached_property
-from typing import Generator, Self, ClassVar
+from dataclasses import dataclass
+from typing import Self, ClassVar
 
 from advent.registry import register_solver
 
 DEBUG = False
 
-Point3D = namedtuple("Point3D", ["x", "y", "z"])
-
 
 @dataclass
 class Brick:
@@ -21,35 +17,29 @@ class Brick:
     end_x: int
     end_y: int
     end_z: int
-    held_up_by: set[Self] = field(default_factory=set)
     PATTERN: ClassVar[re.Pattern] = re.compile(r"(\d+),(\d+),(\d+)~(\d+),(\d+),(\d+)")
 
-    def generate_coords(self) -> Generator[Point3D, None, None]:
-        for x in range(self.start_x, self.end_x + 1):
-            for y in range(self.start_y, self.end_y + 1):
-                for z in range(self.start_z, self.end_z + 1):
-                    yield Point3D(x=x, y=y, z=z)
-
-    # Can be cached because it is only used after dropping the brick down
-    @cached_property
-    def coords(self) -> set[Point3D]:
-        return set(self.generate_coords())
-
     @property
     def min_z(self) -> int:
         return min(self.start_z, self.end_z)
 
-    def __repr__(self) -> str:
-        return f"Brick(ident={self.ident}, start=({self.start_x}, {self.start_y}, {self.start_z}), end=({self.end_x}, {self.end_y}, {self.end_z}), held_up_by={[b.ident for b in self.held_up_by]}"
-
-    def __hash__(self):
-        return hash(self.ident)
-
-    def __eq__(self, other):
-        if isinstance(other, Brick):
-            return self.ident == other.ident
-        else:
-            raise ValueError(f"Cannot compare with {other}")
+    @property
+    def height(self) -> int:
+        return abs(self.end_z - self.start_z) + 1
+
+    def footprint(self, depth: int) -> range | list[int]:
+        """ Cells of the heightmap, packed as x * depth + y, below this brick
+        """
+        min_x, max_x = sorted((self.start_x, self.end_x))
+        min_y, max_y = sorted((self.start_y, self.end_y))
+        if min_x == max_x:
+            return range(min_x * depth + min_y, min_x * depth + max_y + 1)
+        return [x * depth + y for x in range(min_x, max_x + 1) for y in range(min_y, max_y + 1)]
+
+    def move_to(self, min_z: int):
+        offset = min_z - self.min_z
+        self.start_z += offset
+        self.end_z += offset
 
     @staticmethod
     def from_line(ident: int, line: str) -> Self:
@@ -66,96 +56,99 @@ class Brick:
             raise ValueError(f"Invalid line {line}")
 
 
-def get_lower_bricks(bricks_per_min_z: dict[int, list[Brick]], max_z: int) -> Generator[Brick, None, None]:
-    for z in bricks_per_min_z.keys():
-        if z < max_z:
-            yield from bricks_per_min_z[z]
-
-
-def parse(puzzle_input: list[str]) -> dict[int, list[Brick]]:
-    bricks_per_min_z = defaultdict(list)
-    for ident, line in enumerate(puzzle_input):
-        brick = Brick.from_line(ident, line)
-        bricks_per_min_z[brick.min_z].append(brick)
-    return bricks_per_min_z
-
-
-def drop_down_and_determine_held_up_by(bricks_per_min_z: dict[int, list[Brick]]):
-    # Do the dropping down but also fill the held_up_by
-    for min_z in sorted(bricks_per_min_z.keys()):
-        if DEBUG:
-            print(f"Dropping down bricks at original min_z: {min_z}, length of bricks to check: {len(bricks_per_min_z[min_z])}")
-        for brick in bricks_per_min_z[min_z].copy():
-            bricks_per_min_z[min_z].remove(brick)
-            dropped_down = True
-            while dropped_down:
-                lower_bricks = list(get_lower_bricks(bricks_per_min_z, brick.min_z))
-                if lower_bricks:
-                    dropped_down_coords = set(Point3D(x, y, z-1) for x, y, z in brick.generate_coords())
-                    for lower_brick in lower_bricks:
-                        if not lower_brick.coords.isdisjoint(dropped_down_coords):
-                            brick.held_up_by.add(lower_brick)
-                            dropped_down = False
-                else:
-                    dropped_down = False
-                if dropped_down:
-                    brick.start_z = brick.start_z - 1
-                    brick.end_z = brick.end_z - 1
-            if DEBUG:
-                if brick.min_z < min_z:
-                    print(f"Dropped down brick to {brick}")
-                else:
-                    print(f"Cannot drop down {brick}")
-            bricks_per_min_z[brick.min_z].append(brick)
-    return bricks_per_min_z
-
-
-def split_bricks_on_removable(bricks_per_min_z: dict[int, list[Brick]]) -> tuple[set[Brick], set[Brick], set[Brick]]:
-    all_bricks = set()
-    non_removable_bricks = set()
-    for min_z in sorted(bricks_per_min_z.keys()):
+@dataclass
+class Stack:
+    bricks: list[Brick]
+    # Bricks in the order they settled, every brick after the ones holding it up
+    order: list[int]
+    # Idents of the bricks each brick rests on directly, empty for bricks on the ground
+    held_up_by: list[list[int]]
+
+
+def parse(puzzle_input: list[str]) -> list[Brick]:
+    return [Brick.from_line(ident, line) for ident, line in enumerate(puzzle_input)]
+
+
+def settle(bricks: list[Brick]) -> Stack:
+    """ Drop the bricks lowest first onto a heightmap of the highest brick top and which brick that is per x, y column
+    """
+    depth = max(max(brick.start_y, brick.end_y) for brick in bricks) + 1
+    width = max(max(brick.start_x, brick.end_x) for brick in bricks) + 1
+    top_heights = [0] * (width * depth)
+    top_bricks = [-1] * (width * depth)
+    order = sorted(range(len(bricks)), key=lambda ident: bricks[ident].min_z)
+    held_up_by: list[list[int]] = [[] for _ in bricks]
+    for ident in order:
+        brick = bricks[ident]
+        footprint = brick.footprint(depth)
+        resting_height = max(top_heights[cell] for cell in footprint)
+        if resting_height:
+            held_up_by[ident] = list({top_bricks[cell] for cell in footprint if top_heights[cell] == resting_height})
+        brick.move_to(resting_height + 1)
+        new_top = resting_height + brick.height
+        for cell in footprint:
+            top_heights[cell] = new_top
+            top_bricks[cell] = ident
         if DEBUG:
-            print(f"Listing bricks at min_z {min_z}")
-        for brick in bricks_per_min_z[min_z]:
-            if DEBUG:
-                print(f"{brick}")
-            all_bricks.add(brick)
-            if len(brick.held_up_by) == 1:
-                non_removable_bricks.update(brick.held_up_by)
-    return all_bricks, all_bricks - non_removable_bricks, non_removable_bricks
+            print(f"Settled {brick} on {held_up_by[ident]}")
+    return Stack(bricks=bricks, order=order, held_up_by=held_up_by)
+
+
+def removable_bricks(stack: Stack) -> set[int]:
+    sole_supports = {supporters[0] for supporters in stack.held_up_by if len(supporters) == 1}
+    return set(range(len(stack.bricks))) - sole_supports
+
+
+def dominator_depths(stack: Stack) -> list[int]:
+    """ A brick falls when one of its dominators is removed: a brick all its paths down to the ground run through.
+        Its nearest dominator is the lowest common ancestor of the bricks holding it up in the dominator tree, with the
+        ground as root. Bricks settled in order, so all those ancestors are known already. Binary lifting keeps the
+        lowest common ancestor logarithmic. Returns the number of dominators per brick, not counting the ground.
+    """
+    ground = len(stack.bricks)
+    levels = max(1, ground.bit_length())
+    depths = [0] * (ground + 1)
+    # ancestors[level][brick] is 2 ** level steps up the dominator tree, the ground is its own ancestor
+    ancestors = [[ground] * (ground + 1) for _ in range(levels)]
+
+    def common_ancestor(first: int, second: int) -> int:
+        if depths[first] < depths[second]:
+            first, second = second, first
+        difference = depths[first] - depths[second]
+        for level in range(levels):
+            if difference >> level & 1:
+                first = ancestors[level][first]
+        if first == second:
+            return first
+        for level in reversed(range(levels)):
+            if ancestors[level][first] != ancestors[level][second]:
+                first, second = ancestors[level][first], ancestors[level][second]
+        return ancestors[0][first]
+
+    for ident in stack.order:
+        dominator = ground
+        if supporters := stack.held_up_by[ident]:
+            dominator = supporters[0]
+            for supporter in supporters[1:]:
+                dominator = common_ancestor(dominator, supporter)
+        depths[ident] = depths[dominator] + 1
+        ancestors[0][ident] = dominator
+        for level in range(1, levels):
+            ancestors[level][ident] = ancestors[level - 1][ancestors[level - 1][ident]]
+    return [depth - 1 for depth in depths[:ground]]
 
 
 @register_solver(year="2023", key="22", variation="a")
 def solve_a(puzzle_input: list[str], example: bool) -> None:
     print(puzzle_input)
-    bricks_per_min_z = parse(puzzle_input)
-
-    bricks_per_min_z = drop_down_and_determine_held_up_by(bricks_per_min_z)
-
-    _, removable_bricks, _ = split_bricks_on_removable(bricks_per_min_z)
-    print(len(removable_bricks))
+    stack = settle(parse(puzzle_input))
+    print(len(removable_bricks(stack)))
 
 
 @register_solver(year="2023", key="22", variation="b")
 def solve_b(puzzle_input: list[str], example: bool) -> None:
     print(puzzle_input)
-    bricks_per_min_z = parse(puzzle_input)
-
-    bricks_per_min_z = drop_down_and_determine_held_up_by(bricks_per_min_z)
-
-    all_bricks, _, non_removable_bricks = split_bricks_on_removable(bricks_per_min_z)
-    print(f"Got {len(non_removable_bricks)} non_removable_bricks to check")
-    solution = 0
-    for start_brick in non_removable_bricks:
-        removed_bricks: set[Brick] = set()
-        removed_bricks.add(start_brick)
-        new_collapses = True
-        while new_collapses:
-            new_collapses = False
-            for brick in all_bricks - removed_bricks:
-                if brick.held_up_by and brick.held_up_by.issubset(removed_bricks):
-                    removed_bricks.add(brick)
-                    new_collapses = True
-        print(f"Removing brick {start_brick} results in a chain reaction of {len(removed_bricks) - 1}")
-        solution += len(removed_bricks) - 1
+    stack = settle(parse(puzzle_input))
+    # Removing a brick drops exactly the bricks it dominates, so summing over all removals counts every brick once per dominator
+    solution = sum(dominator_depths(stack))
     print(solution)
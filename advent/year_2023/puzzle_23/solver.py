@@ -1,10 +1,10 @@
-from functools import partial
 from typing import Callable
 
-from advent.utils.graph import Vertex, VertexPath, print_graph, find_all_paths
+from advent.utils.graph import Vertex, CSRGraph, print_graph, longest_simple_path
 from advent.registry import register_solver
 from advent.utils.enums import PrintEnum, Direction
 from advent.utils.grid import Grid, T
+from advent.utils.solver import solver_jobs
 
 DEBUG = False
 
@@ -100,6 +100,9 @@ def generate_graph(start_vertex: Vertex, grid: TileGrid) -> list[Vertex]:
                                         [direction for direction in grid.value_at(x, y).allowed_exits()])):
                     to_process.add((direction, new_vertex))
             vertex.add_unidirectional_edge(other_vertex=new_vertex, weight=len(visited_coords))
+        elif (x, y) in vertices:
+            # Back at the start, without slopes nothing stops us walking there
+            vertex.add_unidirectional_edge(other_vertex=vertices[(x, y)], weight=len(visited_coords))
         else:
             new_vertex = Vertex(str(current_ident), x, y)
             if DEBUG:
@@ -113,11 +116,7 @@ def generate_graph(start_vertex: Vertex, grid: TileGrid) -> list[Vertex]:
     return list(vertices.values())
 
 
-def path_finished(path: VertexPath, target_y: int) -> bool:
-    return path.current_vertex.coords[1] == target_y
-
-
-def solve_for_grid(grid: TileGrid) -> int:
+def solve_for_grid(grid: TileGrid, jobs: int | None = None) -> int:
     start_x = 0
     for x in range(0, grid.width):
         if grid.value_at(x, 0).can_move_to:
@@ -126,14 +125,14 @@ def solve_for_grid(grid: TileGrid) -> int:
     vertices = generate_graph(start_vertex, grid)
     print(f"Graph generated, {vertices}")
     print_graph(vertices)
-    solution = max(
-        find_all_paths(
-            start_path=VertexPath(current_vertex=start_vertex),
-            path_finished_function=partial(path_finished, target_y=grid.height - 1),
-        ),
-        key=lambda p: p.length,
-    )
-    return solution.length
+    end_vertices = [vertex for vertex in vertices if vertex.coords[1] == grid.height - 1]
+    if len(end_vertices) != 1:
+        raise ValueError(f"Expected a single way out at the bottom, found {end_vertices}")
+    graph = CSRGraph.from_vertices(vertices)
+    return longest_simple_path(graph,
+                               start=graph.index(start_vertex.ident),
+                               target=graph.index(end_vertices[0].ident),
+                               jobs=jobs)
 
 
 def ignore_certain_chars_converter(char: str, converter: Callable[[str], T]) -> T:
@@ -155,4 +154,4 @@ def solve_a(puzzle_input: list[str], example: bool) -> None:
 def solve_b(puzzle_input: list[str], example: bool) -> None:
     print(puzzle_input)
     grid: FreeTileGrid = Grid.from_lines(puzzle_input, lambda c: ignore_certain_chars_converter(c, FreeTileStatus.from_char))
-    print(f"Found max path with length {solve_for_grid(grid)}")
+    print(f"Found max path with length {solve_for_grid(grid, jobs=solver_jobs(example))}")
@@ -34,10 +34,8 @@ def generate_part_numbers(puzzle_input: list[str]) -> Generator[int, None, None]
 
 
 @register_solver(year="2023", key="3", variation="a")
-def solve_a(puzzle_input: list[str], example: bool) -> None:
-    print(puzzle_input)
-    solution = sum(generate_part_numbers(puzzle_input))
-    print(solution)
+def solve_a(puzzle_input: list[str], example: bool) -> int:
+    return sum(generate_part_numbers(puzzle_input))
 
 
 def has_gear(puzzle_input: list[str], min_x: int, min_y: int, max_x: int, max_y: int) -> tuple[str, int, int]:
@@ -63,11 +61,9 @@ def generate_gear_numbers(puzzle_input: list[str]) -> Generator[tuple[int, int,
 
 
 @register_solver(year="2023", key="3", variation="b")
-def solve_b(puzzle_input: list[str], example: bool) -> None:
-    print(puzzle_input)
+def solve_b(puzzle_input: list[str], example: bool) -> int:
     gears_by_coords: dict[tuple[int, int], list[int]] = defaultdict(list)
     for gear, x, y in generate_gear_numbers(puzzle_input):
         gears_by_coords[(x,y)].append(gear)
 
-    solution = sum(prod(gears) for gears in gears_by_coords.values() if len(gears) == 2)
-    print(solution)
+    return sum(prod(gears) for gears in gears_by_coords.values() if len(gears) == 2)
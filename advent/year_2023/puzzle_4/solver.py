@@ -39,21 +39,17 @@ class Card:
 
 
 @register_solver(year="2023", key="4", variation="a")
-def solve_a(puzzle_input: list[str], example: bool) -> None:
-    print(puzzle_input)
+def solve_a(puzzle_input: list[str], example: bool) -> int:
     cards = [Card.from_line(line) for line in puzzle_input]
-    solution = sum(card.power_value() for card in cards)
-    print(solution)
+    return sum(card.power_value() for card in cards)
 
 
 @register_solver(year="2023", key="4", variation="b")
-def solve_b(puzzle_input: list[str], example: bool) -> None:
-    print(puzzle_input)
+def solve_b(puzzle_input: list[str], example: bool) -> int:
     cards = [Card.from_line(line) for line in puzzle_input]
     card_count: dict[int, int] = defaultdict(lambda: 1)
     for card in cards:
         if wins := card.num_winning_cards():
             for i in range(1, wins+1):
                 card_count[card.card_id+i] += card_count[card.card_id]
-    solution = sum(card_count[card.card_id] for card in cards)
-    print(solution)
+    return sum(card_count[card.card_id] for card in cards)
@@ -3,14 +3,12 @@ from advent.registry import register_solver
 
 
 @register_solver(year="2023", key="5", variation="a")
-def solve_a(puzzle_input: list[str], example: bool) -> None:
-    print(puzzle_input)
+def solve_a(puzzle_input: list[str], example: bool) -> int:
     problem = ProblemA.from_string(puzzle_input)
-    print(problem.solve())
+    return problem.solve()
 
 
 @register_solver(year="2023", key="5", variation="b")
-def solve_b(puzzle_input: list[str], example: bool) -> None:
-    print(puzzle_input)
+def solve_b(puzzle_input: list[str], example: bool) -> int:
     problem = ProblemB.from_string(puzzle_input)
-    print(problem.solve())
+    return problem.solve()
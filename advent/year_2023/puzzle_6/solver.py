@@ -70,17 +70,14 @@ def parse_ignore_spaces(puzzle_input: list[str]) -> tuple[int, int]:
 
 
 @register_solver(year="2023", key="6", variation="a")
-def solve_a(puzzle_input: list[str], example: bool) -> None:
-    print(puzzle_input)
+def solve_a(puzzle_input: list[str], example: bool) -> int:
     solution = prod(ways_to_win_with_log(time, distance) for time, distance in parse(puzzle_input))
     # time 53, distance 275: 6 * 47 to 47 * 6 = 42 options
     # time 78, distance 1215: 22 * 56 to 56 * 22 = 35 options
     # time 30, distance 200: 11 * 19 to 19 * 11 = 9 options
-    print(solution)
+    return solution
 
 
 @register_solver(year="2023", key="6", variation="b")
-def solve_b(puzzle_input: list[str], example: bool) -> None:
-    print(puzzle_input)
-    solution = ways_to_win_with_log(*parse_ignore_spaces(puzzle_input))
-    print(solution)
+def solve_b(puzzle_input: list[str], example: bool) -> int:
+    return ways_to_win_with_log(*parse_ignore_spaces(puzzle_input))
@@ -116,20 +116,16 @@ class JokerHand(Hand):
 
 
 @register_solver(year="2023", key="7", variation="a")
-def solve_a(puzzle_input: list[str], example: bool) -> None:
-    print(puzzle_input)
+def solve_a(puzzle_input: list[str], example: bool) -> int:
     solution = 0
     for i, hand in enumerate(sorted([Hand.from_string(line) for line in puzzle_input]), start=1):
-        print(f"Hand {i} = {hand} ")
         solution += i * hand.bid
-    print(solution)
+    return solution
 
 
 @register_solver(year="2023", key="7", variation="b")
-def solve_b(puzzle_input: list[str], example: bool) -> None:
-    print(puzzle_input)
+def solve_b(puzzle_input: list[str], example: bool) -> int:
     solution = 0
     for i, hand in enumerate(sorted([JokerHand.from_string(line) for line in puzzle_input]), start=1):
-        print(f"Hand {i} = {hand} ")
         solution += i * hand.bid
-    print(solution)
+    return solution
@@ -1,10 +1,9 @@
-import datetime
-
 from collections import deque, defaultdict
 from dataclasses import field, dataclass
 from typing import Generator
 
 from advent.year_2023.puzzle_8.node import Node
+from advent.utils.timing import span
 
 
 @dataclass
@@ -40,15 +39,15 @@ class AnalyzedNode(Node):
 def analyze_nodes(nodes_dict: dict[str, AnalyzedNode], instructions: str, partial_instructions_list: list[PartialInstruction]):
     for node in nodes_dict.values():
         if node.is_ending_node():
-            print(f"Starting node {node.node_id} at {datetime.datetime.now()}")
-            for path in generate_paths(node, nodes_dict, partial_instructions_list):
-                node.add_to_paths(path)
-                print(f"Found a path from {node.node_id} to {path.target} with length {path.length}")
-            print(f"Got paths for {node.node_id} at {datetime.datetime.now()}")
+            with span("paths"):
+                for path in generate_paths(node, nodes_dict, partial_instructions_list):
+                    node.add_to_paths(path)
+                    print(f"Found a path from {node.node_id} to {path.target} with length {path.length}")
+            print(f"Got paths for {node.node_id}")
         elif node.node_id.endswith("A"):
-            print(f"Starting node {node.node_id} at {datetime.datetime.now()}")
-            node.lead_time = generate_lead_time(node, nodes_dict, instructions)
-            print(f"Got lead time for {node.node_id}, namely {node.lead_time} at {datetime.datetime.now()}")
+            with span("lead time"):
+                node.lead_time = generate_lead_time(node, nodes_dict, instructions)
+            print(f"Got lead time for {node.node_id}, namely {node.lead_time}")
 
 
 def generate_paths(node: AnalyzedNode, nodes_dict: [str, AnalyzedNode], partial_instructions_list: list[PartialInstruction]) -> Generator[Path, None, None]:
@@ -6,6 +6,7 @@ from advent.year_2023.puzzle_8.analyzer import AnalyzedNode
 from advent.year_2023.puzzle_8.instructor import InstructedNode, instruct_nodes
 from advent.registry import register_solver
 from advent.utils.all_equal import all_equal
+from advent.utils.timing import span
 
 
 class Attempt:
@@ -58,8 +59,7 @@ class Attempt:
 
 
 @register_solver(year="2023", key="8", variation="a")
-def solve_a(puzzle_input: list[str], example: bool) -> None:
-    print(puzzle_input)
+def solve_a(puzzle_input: list[str], example: bool) -> int:
     instructions = puzzle_input[0]
     if puzzle_input[1] != "":
         raise ValueError("Missing separation line between instructions and nodes in the input")
@@ -68,7 +68,7 @@ def solve_a(puzzle_input: list[str], example: bool) -> None:
     attempt = Attempt(instructions=instructions, nodes_list=nodes_list, current_node=nodes["AAA"])
     while not attempt.can_finish():
         attempt.progress_one_step()
-    print(attempt.lowest_steps())
+    return attempt.lowest_steps()
 
 
 def solve_b_with_reduction_of_graph(puzzle_input: list[str], example: bool) -> None:
@@ -76,29 +76,29 @@ def solve_b_with_reduction_of_graph(puzzle_input: list[str], example: bool) -> N
     MAX_PATH_LENGTH = 2000
 
     print(puzzle_input)
-    print(f"Started at {datetime.datetime.now()}")
-    instructions = puzzle_input[0]
-    if puzzle_input[1] != "":
-        raise ValueError("Missing separation line between instructions and nodes in the input")
-    nodes_list = [AnalyzedNode.from_string(line) for line in puzzle_input[2:]]
-    partial_instructions_list = list(generate_possible_instructions(instructions, max_length=MAX_PATH_LENGTH))
-    print(f"Length of partial_instructions_list is: {len(partial_instructions_list)}")
-    attempts = [Attempt(instructions=instructions, nodes_list=nodes_list, current_node=node) for node in nodes_list if node.node_id.endswith("A")]
-    print(f"Created attempts at {datetime.datetime.now()}")
-    # Extra in part b, analyze the nodes for extra info
-    analyze_nodes(nodes_dict={node.node_id: node for node in nodes_list}, instructions=instructions, partial_instructions_list=partial_instructions_list)
-    print(f"Finished analyzing nodes at {datetime.datetime.now()}")
-    for attempt in attempts:
-        attempt.process_lead_time()
-    print(f"Finished processing lead times at {datetime.datetime.now()}")
+    with span("parse"):
+        instructions = puzzle_input[0]
+        if puzzle_input[1] != "":
+            raise ValueError("Missing separation line between instructions and nodes in the input")
+        nodes_list = [AnalyzedNode.from_string(line) for line in puzzle_input[2:]]
+    with span("build"):
+        partial_instructions_list = list(generate_possible_instructions(instructions, max_length=MAX_PATH_LENGTH))
+        print(f"Length of partial_instructions_list is: {len(partial_instructions_list)}")
+        attempts = [Attempt(instructions=instructions, nodes_list=nodes_list, current_node=node) for node in nodes_list if node.node_id.endswith("A")]
+    with span("analyze"):
+        # Extra in part b, analyze the nodes for extra info
+        analyze_nodes(nodes_dict={node.node_id: node for node in nodes_list}, instructions=instructions, partial_instructions_list=partial_instructions_list)
+        for attempt in attempts:
+            attempt.process_lead_time()
     for attempt in attempts:
         print(f"At {attempt.locations}")
-    while not all_equal(attempt.lowest_steps() for attempt in attempts):
-        earliest_attempt = min(attempts)
-        furthest_steps = max(attempts).lowest_steps()
-        print(f"Currently processing an attempt with {earliest_attempt.lowest_steps()} steps. Furthest is on {furthest_steps}, time {datetime.datetime.now()}")
-        earliest_attempt.process_paths()
-        print(f"After processing paths, locations are now: {earliest_attempt.locations}")
+    with span("search"):
+        while not all_equal(attempt.lowest_steps() for attempt in attempts):
+            earliest_attempt = min(attempts)
+            furthest_steps = max(attempts).lowest_steps()
+            print(f"Currently processing an attempt with {earliest_attempt.lowest_steps()} steps. Furthest is on {furthest_steps}")
+            earliest_attempt.process_paths()
+            print(f"After processing paths, locations are now: {earliest_attempt.locations}")
     print(attempts[0].lowest_steps())
 
 
@@ -119,22 +119,22 @@ def reach_end(current_nodes: list[InstructedNode], nodes_dict: dict[str, Instruc
             print(f"At {current_iteration_start:,} at {datetime.datetime.now()}")
 
 
-def solve_b_with_instructions(puzzle_input: list[str], example: bool) -> None:
-    print(puzzle_input)
-    print(f"Started at {datetime.datetime.now()}")
-    instructions = puzzle_input[0]
-    copies = 1 if example else 1000
-    instructions = "".join([instructions] * copies)
-    if puzzle_input[1] != "":
-        raise ValueError("Missing separation line between instructions and nodes in the input")
-    nodes_list = [InstructedNode.from_string(line) for line in puzzle_input[2:]]
-    nodes_dict = {node.node_id: node for node in nodes_list}
-    instruct_nodes(nodes_dict, instructions)
-    print(f"Finished instructing nodes at {datetime.datetime.now()}")
+def solve_b_with_instructions(puzzle_input: list[str], example: bool) -> int:
+    with span("parse"):
+        instructions = puzzle_input[0]
+        copies = 1 if example else 1000
+        instructions = "".join([instructions] * copies)
+        if puzzle_input[1] != "":
+            raise ValueError("Missing separation line between instructions and nodes in the input")
+        nodes_list = [InstructedNode.from_string(line) for line in puzzle_input[2:]]
+        nodes_dict = {node.node_id: node for node in nodes_list}
+    with span("instruct"):
+        instruct_nodes(nodes_dict, instructions)
     current_nodes = [node for node in nodes_dict.values() if node.node_id.endswith("A")]
-    print(reach_end(current_nodes, nodes_dict, len(instructions)))
+    with span("search"):
+        return reach_end(current_nodes, nodes_dict, len(instructions))
 
 
 @register_solver(year="2023", key="8", variation="b")
-def solve_b(puzzle_input: list[str], example: bool) -> None:
-    solve_b_with_instructions(puzzle_input, example)
+def solve_b(puzzle_input: list[str], example: bool) -> int:
+    return solve_b_with_instructions(puzzle_input, example)
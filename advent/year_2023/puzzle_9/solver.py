@@ -1,3 +1,6 @@
+from typing import Iterator
+
+from advent.inputs import InputForm
 from advent.registry import register_solver
 
 
@@ -29,15 +32,11 @@ def line_to_elements(line: str) -> list[int]:
     return list(map(int, line.split()))
 
 
-@register_solver(year="2023", key="9", variation="a")
-def solve_a(puzzle_input: list[str], example: bool) -> None:
-    print(puzzle_input)
-    solution = sum(calculate_next_element(line_to_elements(line)) for line in puzzle_input)
-    print(solution)
+@register_solver(year="2023", key="9", variation="a", input_form=InputForm.LINE_ITERATOR)
+def solve_a(puzzle_input: Iterator[str], example: bool) -> int:
+    return sum(calculate_next_element(line_to_elements(line)) for line in puzzle_input)
 
 
-@register_solver(year="2023", key="9", variation="b")
-def solve_b(puzzle_input: list[str], example: bool) -> None:
-    print(puzzle_input)
-    solution = sum(calculate_previous_element(line_to_elements(line)) for line in puzzle_input)
-    print(solution)
+@register_solver(year="2023", key="9", variation="b", input_form=InputForm.LINE_ITERATOR)
+def solve_b(puzzle_input: Iterator[str], example: bool) -> int:
+    return sum(calculate_previous_element(line_to_elements(line)) for line in puzzle_input)
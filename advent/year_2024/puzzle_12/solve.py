@@ -1,12 +1,11 @@
-from collections import deque, namedtuple
+from array import array
 from collections.abc import Generator
-from dataclasses import field, dataclass
-from functools import cached_property
-from itertools import pairwise, starmap
+from dataclasses import dataclass
+from typing import Self
 
 from advent.registry import register_solver
+from advent.utils.array_grid import numpy_available, label_components, shifted, np
 from advent.utils.enums import PrintEnum, Direction
-from advent.utils.grid import Grid
 
 
 class TileStatus(PrintEnum):
@@ -39,78 +38,117 @@ class TileStatus(PrintEnum):
     Z = "Z", "Z"
 
 
-TileGrid = Grid[TileStatus]
-
-Coords = namedtuple("Coords", ["x", "y"])
+# Index of a letter in TileStatus, 0 (UNKNOWN) is left for the border around the garden
+TILE_STATUSES = list(TileStatus)
+LETTER_INDEX = {tile.str_repr: index for index, tile in enumerate(TILE_STATUSES) if tile != TileStatus.UNKNOWN}
+# Each corner of a cell is checked against its horizontal and vertical neighbours and the diagonal cell between those
+QUADRANTS = [(Direction.EAST, Direction.NORTH), (Direction.EAST, Direction.SOUTH),
+             (Direction.WEST, Direction.NORTH), (Direction.WEST, Direction.SOUTH)]
 
 
 @dataclass
 class Region:
-    grid: TileGrid
     value: TileStatus
-    coords: set[Coords] = field(default_factory=set)
-
-    @property
-    def area(self) -> int:
-        return len(self.coords)
-
-    @cached_property
-    def perimeter(self):
-        return sum(
-            1 for x, y in self.coords for direction in Direction.all()
-            if self.grid.value_at_or(*direction.next_coords(x, y), default=TileStatus.UNKNOWN) != self.value
-        )
-
-    @cached_property
-    def side_count(self):
-        def count_new_side(primary: tuple[int, int], secondary: tuple[int, int]) -> int:
-            if primary[0] == secondary[0] and primary[1] + 1 == secondary[1]:
-                return 0
-            else:
-                return 1
-
-        result = 0
-        for direction in Direction.all():
-            edge_coords: set[Coords] = set()
-            for (x, y) in self.coords:
-                if self.grid.value_at_or(*direction.next_coords(x, y), default=TileStatus.UNKNOWN) != self.value:
-                    edge_coords.add(Coords(x, y))
-            if direction in [Direction.WEST, Direction.EAST]:
-                extracted_coords = map(lambda c: (c.x, c.y), edge_coords)
-            else:
-                extracted_coords = map(lambda c: (c.y, c.x), edge_coords)
-            result += sum(starmap(count_new_side, pairwise(sorted(extracted_coords)))) + 1
-        return result
-
-
-def generate_regions(grid: TileGrid) -> Generator[Region, None, None]:
-    coords_done: set[Coords] = set()
-    for x, y, tile in grid.coords_iterator:
-        if (x, y) not in coords_done:
-            region = Region(grid=grid, value=tile, coords={(x, y)})
-            coords: deque[Coords] = deque([Coords(x, y)])
-            while coords:
-                current_x, current_y = coords.pop()
-                for direction in Direction.all():
-                    new_x, new_y = direction.next_coords(current_x, current_y)
-                    if (new_x, new_y) not in region.coords:
-                        if grid.value_at_or(new_x, new_y, default=TileStatus.UNKNOWN) == region.value:
-                            coords.append(Coords(new_x, new_y))
-                            region.coords.add(Coords(new_x, new_y))
-            coords_done.update(region.coords)
-            print(f"Defined region for {region.value=} with {region.area=}, {region.perimeter=} and {region.side_count=}")
-            yield region
+    area: int = 0
+    perimeter: int = 0
+    # A polygon has as many sides as corners
+    side_count: int = 0
+
+
+@dataclass
+class Garden:
+    width: int
+    height: int
+    # Letter indices in row-major order
+    plots: bytes
+
+    @classmethod
+    def from_lines(cls, lines: list[str]) -> Self:
+        return cls(width=len(lines[0]), height=len(lines), plots=bytes(LETTER_INDEX[char] for line in lines for char in line))
+
+
+def generate_regions(garden: Garden) -> Generator[Region, None, None]:
+    regions = _generate_regions_array(garden) if numpy_available() else _generate_regions_loops(garden)
+    for region in regions:
+        print(f"Defined region for {region.value=} with {region.area=}, {region.perimeter=} and {region.side_count=}")
+        yield region
+
+
+def _generate_regions_array(garden: Garden) -> Generator[Region, None, None]:
+    """ Label all regions in one pass over the garden, then count per cell and sum the counts per label
+    """
+    plots = np.frombuffer(garden.plots, dtype=np.uint8).reshape(garden.height, garden.width)
+    labels, count = label_components(plots)
+    same = {direction: shifted(labels, direction) == labels for direction in Direction.all()}
+    perimeters = sum((~same[direction]).astype(np.int64) for direction in Direction.all())
+    corners = np.zeros(labels.shape, dtype=np.int64)
+    for horizontal, vertical in QUADRANTS:
+        diagonal = shifted(shifted(labels, horizontal), vertical) == labels
+        corners += ~same[horizontal] & ~same[vertical]
+        corners += same[horizontal] & same[vertical] & ~diagonal
+    flat_labels = labels.ravel()
+    areas = np.bincount(flat_labels, minlength=count + 1)
+    perimeters = np.bincount(flat_labels, weights=perimeters.ravel(), minlength=count + 1).astype(np.int64)
+    side_counts = np.bincount(flat_labels, weights=corners.ravel(), minlength=count + 1).astype(np.int64)
+    # Every plot has a label, so these are the first cells of labels 1..count
+    _, first_cells = np.unique(flat_labels, return_index=True)
+    for label in range(1, count + 1):
+        yield Region(value=TILE_STATUSES[garden.plots[first_cells[label - 1]]], area=int(areas[label]),
+                     perimeter=int(perimeters[label]), side_count=int(side_counts[label]))
+
+
+def _generate_regions_loops(garden: Garden) -> Generator[Region, None, None]:
+    """ Flood fill every unlabelled plot in row-major order, counting area, fences and corners as the cells get labelled
+    """
+    # Padding the garden with UNKNOWN plots means neighbours never need a bounds check
+    width = garden.width + 2
+    plots = bytearray(width * (garden.height + 2))
+    for y in range(garden.height):
+        start = (y + 1) * width + 1
+        plots[start:start + garden.width] = garden.plots[y * garden.width:(y + 1) * garden.width]
+
+    def offset(direction: Direction) -> int:
+        dx, dy = direction.next_coords(0, 0)
+        return dx + dy * width
+
+    offsets = [offset(direction) for direction in Direction.all()]
+    quadrants = [(offset(horizontal), offset(vertical)) for horizontal, vertical in QUADRANTS]
+    labels = array("l", [0]) * len(plots)
+    label = 0
+    for cell, value in enumerate(plots):
+        if not value or labels[cell]:
+            continue
+        label += 1
+        labels[cell] = label
+        region = Region(value=TILE_STATUSES[value])
+        to_visit = [cell]
+        while to_visit:
+            current = to_visit.pop()
+            region.area += 1
+            for neighbour_offset in offsets:
+                neighbour = current + neighbour_offset
+                if plots[neighbour] != value:
+                    region.perimeter += 1
+                elif not labels[neighbour]:
+                    labels[neighbour] = label
+                    to_visit.append(neighbour)
+            for horizontal, vertical in quadrants:
+                same_horizontal = plots[current + horizontal] == value
+                same_vertical = plots[current + vertical] == value
+                if same_horizontal == same_vertical and (not same_horizontal or plots[current + horizontal + vertical] != value):
+                    region.side_count += 1
+        yield region
 
 
 @register_solver(year="2024", key="12", variation="a")
 def solve_a(puzzle_input: list[str], example: bool) -> None:
     print(puzzle_input)
-    grid: TileGrid = Grid.from_lines(puzzle_input, TileStatus.from_char)
-    print(f"Solution is {sum(map(lambda r: r.area * r.perimeter, generate_regions(grid)))}")
+    garden = Garden.from_lines(puzzle_input)
+    print(f"Solution is {sum(map(lambda r: r.area * r.perimeter, generate_regions(garden)))}")
 
 
 @register_solver(year="2024", key="12", variation="b")
 def solve_b(puzzle_input: list[str], example: bool) -> None:
     print(puzzle_input)
-    grid: TileGrid = Grid.from_lines(puzzle_input, TileStatus.from_char)
-    print(f"Solution is {sum(map(lambda r: r.area * r.side_count, generate_regions(grid)))}")
+    garden = Garden.from_lines(puzzle_input)
+    print(f"Solution is {sum(map(lambda r: r.area * r.side_count, generate_regions(garden)))}")
@@ -3,9 +3,11 @@ import re
 from collections import namedtuple, Counter
 from dataclasses import dataclass
 from enum import Enum
+from statistics import pvariance
 from typing import Self, ClassVar
 
 from advent.registry import register_solver
+from advent.utils.array_grid import numpy_available, np
 
 Coords = namedtuple("Coords", ["x", "y"])
 
@@ -88,13 +90,48 @@ def print_grid(counter: dict[Coords, int], width: int, height: int):
         print("".join(print_chr(x) for x in range(width)))
 
 
-def contains_frame(counter: dict[Coords, int], min_size: int) -> bool:
-    count_x: Counter[int, int] = Counter(map(lambda c: c[0], counter.keys()))
-    if count_x.most_common(2)[-1][1] > min_size:
-        count_y: Counter[int, int] = Counter(map(lambda c: c[1], counter.keys()))
-        return count_y.most_common(2)[-1][1] > min_size
-    else:
-        return False
+def minimum_variance_step(positions: list[int], velocities: list[int], size: int) -> int:
+    """ Along one axis the robots are back where they started after size steps, so the step where they are bunched
+        together the most lies within the first size steps
+    """
+    if numpy_available():
+        return _minimum_variance_step_array(positions, velocities, size)
+    return _minimum_variance_step_loops(positions, velocities, size)
+
+
+def _minimum_variance_step_array(positions: list[int], velocities: list[int], size: int) -> int:
+    current = np.array(positions, dtype=np.int64) % size
+    steps = np.array(velocities, dtype=np.int64) % size
+    variances = np.empty(size)
+    for step in range(size):
+        variances[step] = current.var()
+        current += steps
+        current %= size
+    return int(variances.argmin())
+
+
+def _minimum_variance_step_loops(positions: list[int], velocities: list[int], size: int) -> int:
+    current = [position % size for position in positions]
+    variances = []
+    for _ in range(size):
+        variances.append(pvariance(current))
+        current = [(position + velocity) % size for position, velocity in zip(current, velocities)]
+    return variances.index(min(variances))
+
+
+def combine_steps(step_x: int, width: int, step_y: int, height: int) -> int:
+    """ Chinese remainder theorem: the step that is step_x modulo width and step_y modulo height
+    """
+    if math.gcd(width, height) != 1:
+        raise ValueError(f"Cannot combine the periods of a {width}x{height} room, they share a factor")
+    return step_x + width * ((step_y - step_x) * pow(width, -1, height) % height)
+
+
+def find_tree_step(robots: list[Robot], width: int, height: int) -> int:
+    step_x = minimum_variance_step([robot.start_position.x for robot in robots], [robot.start_velocity.x for robot in robots], width)
+    step_y = minimum_variance_step([robot.start_position.y for robot in robots], [robot.start_velocity.y for robot in robots], height)
+    print(f"Least spread at step {step_x} modulo {width} horizontally and step {step_y} modulo {height} vertically")
+    return combine_steps(step_x, width, step_y, height)
 
 
 @register_solver(year="2024", key="14", variation="b")
@@ -102,14 +139,10 @@ def solve_b(puzzle_input: list[str], example: bool) -> None:
     print(puzzle_input)
     width = 7 if example else 101
     height = 11 if example else 103
-    min_size = 4 if example else 20
 
     robots = [Robot.from_line(line) for line in puzzle_input]
-    steps = 0
-    while True:
-        counter: dict[Coords, int] = Counter(robot.calculate_wrapped_position_after_steps(steps=steps, width=width, height=height) for robot in robots)
-        if contains_frame(counter, min_size):
-            print(f"At step {steps}")
-            print_grid(counter, width, height)
-            print("XMASXMASXMASXMASXMASXMASXMASXMASXMASXMASXMASXMASXMASXMASXMAS")
-        steps += 1
+    steps = find_tree_step(robots, width, height)
+    counter: dict[Coords, int] = Counter(robot.calculate_wrapped_position_after_steps(steps=steps, width=width, height=height) for robot in robots)
+    print_grid(counter, width, height)
+    print("XMASXMASXMASXMASXMASXMASXMASXMASXMASXMASXMASXMASXMASXMASXMAS")
+    print(f"Solution is {steps}")
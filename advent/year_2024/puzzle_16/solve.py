@@ -1,12 +1,12 @@
-from collections import namedtuple, defaultdict
-from copy import copy
-from dataclasses import dataclass, field
+from collections import namedtuple
+from dataclasses import dataclass
 from functools import partial
-from queue import PriorityQueue
+from typing import Iterable, Self
 
 from advent.registry import register_solver
 from advent.utils.enums import PrintEnum, Direction
 from advent.utils.grid import Grid
+from advent.utils.pathfinding import dijkstra, SearchResult, UNREACHED
 
 
 class TileStatus(PrintEnum):
@@ -21,72 +21,95 @@ TileGrid = Grid[TileStatus]
 Coords = namedtuple("Coords", ["x", "y"])
 
 
-@dataclass(order=True, unsafe_hash=True)
-class Visit:
-    cost: int
-    coords: Coords = field(compare=False)
-    direction: Direction = field(compare=False)
-    already_visited: set[Coords] = field(default_factory=set, compare=False, repr=False)
+# States pack a cell and the direction the reindeer faces as (y * width + x) * 4 + direction index
+DIRECTIONS = Direction.all()
+TURNS = [[DIRECTIONS.index(direction.cw), DIRECTIONS.index(direction.ccw)] for direction in DIRECTIONS]
+STEP_COST = 1
+TURN_COST = 1000
 
 
-def find_start_coords(grid: TileGrid) -> Coords:
+@dataclass
+class Maze:
+    width: int
+    height: int
+    passable: bytearray
+    start: int
+    end: int
+
+    @classmethod
+    def from_grid(cls, grid: TileGrid) -> Self:
+        passable = bytearray(tile != TileStatus.WALL for _, _, tile in grid.coords_iterator)
+        start, end = (y * grid.width + x for x, y in (find_coords(grid, TileStatus.START), find_coords(grid, TileStatus.END)))
+        return cls(grid.width, grid.height, passable, start, end)
+
+    def step(self, cell: int, direction_index: int) -> int | None:
+        y, x = divmod(cell, self.width)
+        x, y = DIRECTIONS[direction_index].next_coords(x, y)
+        if 0 <= x < self.width and 0 <= y < self.height and self.passable[y * self.width + x]:
+            return y * self.width + x
+        return None
+
+
+def find_coords(grid: TileGrid, status: TileStatus) -> Coords:
     for x, y, tile in grid.coords_iterator:
-        if tile == TileStatus.START:
+        if tile == status:
             return Coords(x, y)
-    raise ValueError("Grid does not contain a START position")
-
-
-def merge_discard_or_keep(visit: Visit, visitations: dict[Coords, list[Visit]]) -> Visit | None:
-    for other_visit in visitations[visit.coords]:
-        if other_visit.direction == visit.direction:
-            if other_visit.cost == visit.cost:
-                other_visit.already_visited.update(visit.already_visited)
-            else:
-                # discard
-                return None
-    visitations[visit.coords].append(visit)
-    return visit
-
-
-def analyze_grid(grid: TileGrid) -> dict[Coords, list[Visit]]:
-    result: dict[Coords, list[Visit]] = defaultdict(list)
-    to_check: PriorityQueue[Visit] = PriorityQueue()
-    to_check.put(
-        Visit(
-            coords=find_start_coords(grid),
-            direction=Direction.EAST,
-            cost=0,
-        )
-    )
-    while not to_check.empty():
-        visit = to_check.get_nowait()
-        for direction in visit.direction.opposite.all_but_me:
-            if grid.value_at_or(*direction.next_coords(*visit.coords), default=TileStatus.WALL) != TileStatus.WALL:
-                extra_cost = 1
-                if direction != visit.direction:
-                    extra_cost += 1000
-                new_already_visited = copy(visit.already_visited)
-                new_already_visited.add(visit.coords)
-                new_visit = Visit(
-                    coords=Coords(*direction.next_coords(*visit.coords)),
-                    direction=direction,
-                    cost=visit.cost + extra_cost,
-                    already_visited=new_already_visited,
-                )
-                if keep_visit := merge_discard_or_keep(new_visit, result):
-                    to_check.put(keep_visit)
-    return result
+    raise ValueError(f"Grid does not contain a {status} position")
+
+
+def analyze_maze(maze: Maze) -> SearchResult:
+    def neighbours(state: int) -> Iterable[tuple[int, int]]:
+        cell, direction_index = divmod(state, 4)
+        if (next_cell := maze.step(cell, direction_index)) is not None:
+            yield next_cell * 4 + direction_index, STEP_COST
+        for turned_index in TURNS[direction_index]:
+            yield cell * 4 + turned_index, TURN_COST
+
+    return dijkstra(state_count=maze.width * maze.height * 4,
+                    starts=[maze.start * 4 + DIRECTIONS.index(Direction.EAST)],
+                    neighbours=neighbours)
+
+
+def best_end_states(maze: Maze, result: SearchResult) -> tuple[int, list[int]]:
+    end_states = [maze.end * 4 + direction_index for direction_index in range(4) if result.distance(maze.end * 4 + direction_index) is not None]
+    if not end_states:
+        raise ValueError("The end cannot be reached")
+    best = min(result.distances[state] for state in end_states)
+    return best, [state for state in end_states if result.distances[state] == best]
+
+
+def cells_on_best_paths(maze: Maze, result: SearchResult, end_states: list[int]) -> set[Coords]:
+    """ The predecessor DAG holds every move whose cost exactly bridges the distances of its two states, so it never
+        needs storing: one walk backwards from the best end states over those moves finds every best path.
+    """
+    distances = result.distances
+    seen = bytearray(len(distances))
+    to_visit = list(end_states)
+    for state in to_visit:
+        seen[state] = 1
+    cells = set()
+    while to_visit:
+        state = to_visit.pop()
+        cell, direction_index = divmod(state, 4)
+        cells.add(cell)
+        distance = distances[state]
+        predecessors = [(cell * 4 + turned_index, TURN_COST) for turned_index in TURNS[direction_index]]
+        if (previous_cell := maze.step(cell, DIRECTIONS.index(DIRECTIONS[direction_index].opposite))) is not None:
+            predecessors.append((previous_cell * 4 + direction_index, STEP_COST))
+        for predecessor, cost in predecessors:
+            if not seen[predecessor] and distances[predecessor] != UNREACHED and distances[predecessor] + cost == distance:
+                seen[predecessor] = 1
+                to_visit.append(predecessor)
+    return {Coords(*reversed(divmod(cell, maze.width))) for cell in cells}
 
 
 @register_solver(year="2024", key="16", variation="a")
 def solve_a(puzzle_input: list[str], example: bool) -> None:
     print(puzzle_input)
     grid: TileGrid = Grid.from_lines(puzzle_input, TileStatus.from_char)
-    fastest_to = analyze_grid(grid)
-    for coords, visits in fastest_to.items():
-        if grid.value_at(*coords) == TileStatus.END:
-            distance = min(visit.cost for visit in visits)
-            print(f"Solution is {distance}")
+    maze = Maze.from_grid(grid)
+    distance, _ = best_end_states(maze, analyze_maze(maze))
+    print(f"Solution is {distance}")
 
 
 def print_function(x: int, y: int, tile: TileStatus, coords_visited: set[Coords]) -> str:
@@ -100,14 +123,10 @@ def print_function(x: int, y: int, tile: TileStatus, coords_visited: set[Coords]
 def solve_b(puzzle_input: list[str], example: bool) -> None:
     print(puzzle_input)
     grid: TileGrid = Grid.from_lines(puzzle_input, TileStatus.from_char)
-    fastest_to = analyze_grid(grid)
-    for coords, visits in fastest_to.items():
-        if grid.value_at(*coords) == TileStatus.END:
-            distance = min(visit.cost for visit in visits)
-            coords_visited = set()
-            for visit in visits:
-                if visit.cost == distance:
-                    coords_visited.update(visit.already_visited)
-            if example:
-                grid.print_grid_using_coords(partial(print_function, coords_visited=coords_visited))
-            print(f"Solution is {len(coords_visited) + 1}")
+    maze = Maze.from_grid(grid)
+    result = analyze_maze(maze)
+    _, end_states = best_end_states(maze, result)
+    coords_visited = cells_on_best_paths(maze, result, end_states)
+    if example:
+        grid.print_grid_using_coords(partial(print_function, coords_visited=coords_visited))
+    print(f"Solution is {len(coords_visited)}")
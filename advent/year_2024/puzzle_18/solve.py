@@ -1,11 +1,14 @@
 import re
-import sys
-from collections import deque
 from collections.abc import Generator
 
 from advent.registry import register_solver
-from advent.utils.enums import PrintEnum, Direction
+from advent.utils.enums import PrintEnum
 from advent.utils.grid import Grid, Coords
+from advent.utils.pathfinding import bfs, grid_neighbours
+from advent.utils.union_find import DisjointSet
+
+EXAMPLE_SIZE = 7
+SIZE = 71
 
 
 class TileStatus(PrintEnum):
@@ -31,67 +34,78 @@ def drop_bits(grid: TileGrid, bits: list[Coords]):
 
 
 def length_shortest_path(grid: TileGrid, start_coords: Coords, end_coords: Coords) -> int:
-    visited: dict[Coords, int] = {start_coords: 0}
-    boundary: deque[Coords] = deque()
-    boundary.append(start_coords)
-    while boundary:
-        coords = boundary.pop()
-        for direction in Direction.all():
-            new_coords = direction.next_coords(*coords)
-            if grid.value_at_or(*new_coords, default=TileStatus.WALL) != TileStatus.WALL:
-                old_visit = visited.get(new_coords, sys.maxsize)
-                if old_visit > visited[coords] + 1:
-                    visited[new_coords] = visited[coords] + 1
-                    boundary.append(new_coords)
-    return visited[end_coords]
+    width = grid.width
+    end_state = end_coords.y * width + end_coords.x
+    result = bfs(width * grid.height,
+                 starts=[start_coords.y * width + start_coords.x],
+                 neighbours=grid_neighbours(width, grid.height, lambda x, y: grid.value_at(x, y) != TileStatus.WALL),
+                 goal=lambda state: state == end_state)
+    return result.distances[end_state]
 
 
 @register_solver(year="2024", key="18", variation="a")
 def solve_a(puzzle_input: list[str], example: bool) -> None:
     print(puzzle_input)
-    size = 7 if example else 71
+    bits = list(parse_bits(puzzle_input))
+    size = grid_size(bits, example)
     start_coords = Coords(0, 0)
     end_coords = Coords(size - 1, size - 1)
 
     grid = Grid.from_size(size, size, TileStatus.EMPTY)
-    bits = list(parse_bits(puzzle_input))
-
     drop_bits(grid, bits[:12 if example else 1024])
 
     solution = length_shortest_path(grid, start_coords, end_coords)
     print(f"Solution is {solution}")
 
 
-def reachable(grid: TileGrid, start_coords: Coords, end_coords: Coords) -> bool:
-    visited: set[Coords] = set()
-    newly_visited: set[Coords] = {start_coords}
-    while newly_visited and end_coords not in newly_visited:
-        visited.update(newly_visited)
-        newly_visited = {direction.next_coords(*old_coords)
-                         for direction in Direction.all()
-                         for old_coords in newly_visited
-                         if grid.value_at_or(*direction.next_coords(*old_coords), default=TileStatus.WALL) != TileStatus.WALL
-                         }
-        newly_visited.difference_update(visited)
-    return end_coords in newly_visited
-
-
-def determine_first_blocking_bit(grid: TileGrid, bits: list[Coords], start_coords: Coords, end_coords: Coords):
-    index = 0
-    while reachable(grid, start_coords, end_coords):
-        grid.set_value_at(*bits[index], value=TileStatus.WALL)
-        index += 1
-    return bits[index - 1]
+def grid_size(bits: list[Coords], example: bool) -> int:
+    # Larger generated inputs simply drop bits further out
+    return max([EXAMPLE_SIZE if example else SIZE] + [max(bit) + 1 for bit in bits])
+
+
+def determine_first_blocking_bit(size: int, bits: list[Coords], start_coords: Coords, end_coords: Coords) -> Coords:
+    """ Reverse union-find: start from the grid with every bit dropped and remove them again, last dropped first.
+        The first bit whose removal connects start and end is the one that blocked the path.
+    """
+    first_drops = {}
+    for index, bit in enumerate(bits):
+        first_drops.setdefault(bit.y * size + bit.x, index)
+    sets = DisjointSet(size * size)
+    open_cells = bytearray([1]) * (size * size)
+    for cell in first_drops:
+        open_cells[cell] = 0
+
+    def open_cell(cell: int):
+        open_cells[cell] = 1
+        y, x = divmod(cell, size)
+        if x > 0 and open_cells[cell - 1]:
+            sets.union(cell, cell - 1)
+        if x < size - 1 and open_cells[cell + 1]:
+            sets.union(cell, cell + 1)
+        if y > 0 and open_cells[cell - size]:
+            sets.union(cell, cell - size)
+        if y < size - 1 and open_cells[cell + size]:
+            sets.union(cell, cell + size)
+
+    for cell in range(size * size):
+        if open_cells[cell]:
+            open_cell(cell)
+    start, end = start_coords.y * size + start_coords.x, end_coords.y * size + end_coords.x
+    if sets.connected(start, end):
+        raise ValueError("Dropping all bits does not block the path")
+    for cell, index in sorted(first_drops.items(), key=lambda item: item[1], reverse=True):
+        open_cell(cell)
+        if open_cells[start] and open_cells[end] and sets.connected(start, end):
+            return bits[index]
+    raise ValueError("The path is blocked before any bit dropped")
 
 
 @register_solver(year="2024", key="18", variation="b")
 def solve_b(puzzle_input: list[str], example: bool) -> None:
     print(puzzle_input)
-    size = 7 if example else 71
+    bits = list(parse_bits(puzzle_input))
+    size = grid_size(bits, example)
     start_coords = Coords(0, 0)
     end_coords = Coords(size - 1, size - 1)
 
-    grid = Grid.from_size(size, size, TileStatus.EMPTY)
-    bits = list(parse_bits(puzzle_input))
-
-    print(f"Solution is {determine_first_blocking_bit(grid, bits, start_coords, end_coords)}")
+    print(f"Solution is {determine_first_blocking_bit(size, bits, start_coords, end_coords)}")
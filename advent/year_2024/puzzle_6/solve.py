@@ -1,6 +1,12 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Generator, Self
+
 from advent.registry import register_solver
 from advent.utils.enums import PrintEnum, Direction
 from advent.utils.grid import Grid
+from advent.utils.solver import solver_jobs
 
 
 class TileStatus(PrintEnum):
@@ -40,38 +46,123 @@ def solve_a(puzzle_input: list[str], example: bool) -> None:
     print(f"Solution is {len(coords_passed)}")
 
 
-def check_loop(grid: TileGrid,
-               coords_passed: set[tuple[int, int, Direction]],
-               start_x: int,
-               start_y: int,
-               direction: Direction
-               ) -> bool:
-    x, y = start_x, start_y
+# Clockwise, so turning right is the next index
+DIRECTIONS = [Direction.NORTH, Direction.EAST, Direction.SOUTH, Direction.WEST]
+# Jump table entry for walking off the grid
+EXIT = -1
+
+
+@dataclass
+class Lab:
+    width: int
+    height: int
+    walls: bytearray
+    start: int
+    # jumps[direction][cell] is where the guard stops in front of the next wall, EXIT if there is none
+    jumps: list[array]
+
+    @classmethod
+    def from_grid(cls, grid: TileGrid) -> Self:
+        width, height = grid.width, grid.height
+        walls = bytearray(tile == TileStatus.WALL for _, _, tile in grid.coords_iterator)
+        start_x, start_y, _ = find_start_coords(grid)
+        jumps = []
+        for direction in DIRECTIONS:
+            dx, dy = direction.next_coords(0, 0)
+            jump = array("l", [EXIT]) * (width * height)
+            # Fill the cells nearest to the edge the guard walks towards first, so the next cell is always known
+            for y in (range(height) if dy <= 0 else reversed(range(height))):
+                for x in (range(width) if dx <= 0 else reversed(range(width))):
+                    next_x, next_y = x + dx, y + dy
+                    if 0 <= next_x < width and 0 <= next_y < height:
+                        next_cell = next_y * width + next_x
+                        jump[y * width + x] = y * width + x if walls[next_cell] else jump[next_cell]
+            jumps.append(jump)
+        return cls(width=width, height=height, walls=walls, start=start_y * width + start_x, jumps=jumps)
+
+    def patrol(self) -> Generator[tuple[int, int], None, None]:
+        """ Every cell and direction of the guard, one step at a time, until the guard leaves the lab
+        """
+        cell, direction_index = self.start, 0
+        seen = bytearray(self.width * self.height * 4)
+        while True:
+            if seen[cell * 4 + direction_index]:
+                raise ValueError("The guard never leaves the lab")
+            seen[cell * 4 + direction_index] = 1
+            yield cell, direction_index
+            y, x = divmod(cell, self.width)
+            next_x, next_y = DIRECTIONS[direction_index].next_coords(x, y)
+            if not (0 <= next_x < self.width and 0 <= next_y < self.height):
+                return
+            if self.walls[next_y * self.width + next_x]:
+                direction_index = (direction_index + 1) % 4
+            else:
+                cell = next_y * self.width + next_x
+
+
+def _stop_with_obstacle(lab: Lab, cell: int, direction_index: int, obstacle: int) -> int:
+    """ The jump table entry, patched for an extra obstacle in the same row or column ahead of the guard
+    """
+    stop = lab.jumps[direction_index][cell]
+    y, x = divmod(cell, lab.width)
+    obstacle_y, obstacle_x = divmod(obstacle, lab.width)
+    dx, dy = DIRECTIONS[direction_index].next_coords(0, 0)
+    if (obstacle_x - x) * dy != (obstacle_y - y) * dx:
+        return stop
+    steps_to_obstacle = (obstacle_x - x) * dx + (obstacle_y - y) * dy
+    if steps_to_obstacle <= 0:
+        return stop
+    if stop != EXIT:
+        stop_y, stop_x = divmod(stop, lab.width)
+        if steps_to_obstacle > (stop_x - x) * dx + (stop_y - y) * dy:
+            return stop
+    return obstacle - (dx + dy * lab.width)
+
+
+def loops_with_obstacle(lab: Lab, obstacle: int, cell: int, direction_index: int, seen: array, generation: int) -> bool:
+    """ Jump from wall to wall, a loop shows up as a stop in the same direction seen before in this generation
+    """
+    while True:
+        cell = _stop_with_obstacle(lab, cell, direction_index, obstacle)
+        if cell == EXIT:
+            return False
+        direction_index = (direction_index + 1) % 4
+        state = cell * 4 + direction_index
+        if seen[state] == generation:
+            return True
+        seen[state] = generation
 
-    loop_coords_passed: set[tuple[int, int, Direction]] = set()
 
-    while grid.within_bounds(x, y):
-        loop_coords_passed.add((x, y, direction))
-
-        x, y, direction = next_step_simple(grid, x, y, direction)
+def _count_loops(arguments: tuple) -> int:
+    lab, candidates = arguments
+    # Marked with the candidate number instead of cleared for every candidate
+    seen = array("l", [0]) * (lab.width * lab.height * 4)
+    return sum(1 for generation, (obstacle, cell, direction_index) in enumerate(candidates, start=1)
+               if loops_with_obstacle(lab, obstacle, cell, direction_index, seen, generation))
 
-        if (x, y, direction) in coords_passed:
-            return True
-        if (x, y, direction) in loop_coords_passed:
-            return True
 
-    return False
+def obstacle_candidates(lab: Lab) -> list[tuple[int, int, int]]:
+    """ Every cell on the patrol except the start, with the guard's position just before first reaching it.
+        The obstacle was not there before, so the guard gets to that position unchanged and the check can start there.
+    """
+    candidates = []
+    reached = {lab.start}
+    previous = None
+    for cell, direction_index in lab.patrol():
+        if cell not in reached:
+            reached.add(cell)
+            candidates.append((cell, *previous))
+        previous = cell, direction_index
+    return candidates
 
 
-def wall_possible(grid: TileGrid, x: int, y: int, coords_passed: set[tuple[int, int, Direction]]) -> bool:
-    if grid.value_at_or(x, y, default=TileStatus.PATH) == TileStatus.WALL:
-        return False
-    if not grid.within_bounds(x, y):
-        return False
-    walls = {(x, y, Direction.NORTH), (x, y, Direction.WEST), (x, y, Direction.SOUTH), (x, y, Direction.EAST)}
-    if walls.intersection(coords_passed):
-        return False
-    return True
+def count_loop_obstacles(lab: Lab, jobs: int | None = None) -> int:
+    candidates = obstacle_candidates(lab)
+    if jobs and jobs > 1:
+        chunks = [(lab, candidates[start::jobs]) for start in range(jobs)]
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            return sum(executor.map(_count_loops, chunks))
+    return _count_loops((lab, candidates))
 
 
 @register_solver(year="2024", key="6", variation="b")
@@ -80,31 +171,5 @@ def solve_b(puzzle_input: list[str], example: bool) -> None:
     grid: TileGrid = Grid.from_lines(puzzle_input, TileStatus.from_char)
 
     print(f"{grid.width=}, {grid.height=}, size: {grid.width * grid.height}, non-walls: {len(list(tile for tile in grid.tiles_iterator if tile != TileStatus.WALL))}")
-    blocks_possible: set[tuple[int, int]] = set()
-    coords_passed: set[tuple[int, int, Direction]] = set()
-
-    start_x, start_y, direction = find_start_coords(grid)
-
-    x, y = start_x, start_y
-
-    while grid.within_bounds(x, y):
-
-        coords_passed.add((x, y, direction))
-        wall_x, wall_y = direction.next_coords(x, y)
-
-        if wall_possible(grid, wall_x, wall_y, coords_passed):
-            grid.set_value_at(wall_x, wall_y, value=TileStatus.WALL)
-
-            if check_loop(grid, coords_passed, x, y, direction):
-                # Obstacle possible
-                blocks_possible.add((wall_x, wall_y))
-
-            grid.set_value_at(wall_x, wall_y, value=TileStatus.PATH)
-
-        x, y, direction = next_step_simple(grid, x, y, direction)
-
-    if (start_x, start_y) in blocks_possible:
-        blocks_possible.remove((start_x, start_y))
-
-    print(f"{blocks_possible=}")
-    print(f"Solution is {len(blocks_possible)}")
+    lab = Lab.from_grid(grid)
+    print(f"Solution is {count_loop_obstacles(lab, jobs=solver_jobs(example))}")